@@ -1,3 +1,3 @@
 from .claude import ClaudeAV, ClaudeWork
-from .csv_generator import process_json_directory
+from .csv_generator import process_json_directory, process_json_records
 from .cloudviz import CloudViz
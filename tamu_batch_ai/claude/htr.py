@@ -1,23 +1,307 @@
 import os
-import json
+import asyncio
 import base64
+import hashlib
+import importlib.util
+import io
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from collections import defaultdict
+from functools import lru_cache
 from pathlib import Path
+from types import SimpleNamespace
 from typing import Dict, List, Optional, Tuple
 import anthropic
+import httpx
+import orjson
 import re
 import csv
-import PyPDF2
+import time
+from PIL import Image
 
 # Import new utilities
-from ..config import model_config
+from ..config import cache_config, http_config, image_config, message_batch_config, model_config
 from ..prompt_manager import prompt_manager
 from ..parsers import ResponseParser
+from ..response_cache import get_image_cache, get_response_cache, get_semantic_cache, make_key
+
+
+def _http_client_options() -> Dict:
+    """Get the httpx options shared by the sync and async Anthropic clients.
+
+    HTTP/2 is used when the h2 package is installed, letting concurrent
+    requests multiplex over a single TLS connection.
+    """
+    return {
+        "http2": http_config.http2 and importlib.util.find_spec("h2") is not None,
+        "limits": httpx.Limits(
+            max_connections=http_config.max_connections,
+            max_keepalive_connections=http_config.max_keepalive_connections
+        )
+    }
+
+
+def _http_timeout() -> httpx.Timeout:
+    """Get the request timeout shared by the sync and async Anthropic clients."""
+    return httpx.Timeout(http_config.timeout, connect=http_config.connect_timeout)
+
+
+@lru_cache(maxsize=None)
+def get_client(api_key: Optional[str] = None) -> anthropic.Anthropic:
+    """Get a shared Anthropic client for an API key.
+
+    Clients are cached so every Claude object reuses one connection pool.
+
+    Args:
+        api_key: Anthropic API key (defaults to CLAUDE_API environment variable)
+
+    Returns:
+        anthropic.Anthropic client
+    """
+    return anthropic.Anthropic(
+        api_key=api_key or os.environ.get("CLAUDE_API"),
+        timeout=_http_timeout(),
+        max_retries=http_config.max_retries,
+        http_client=anthropic.DefaultHttpxClient(**_http_client_options())
+    )
+
+
+MEDIA_TYPES = {
+    '.jpg': 'image/jpeg',
+    '.jpeg': 'image/jpeg',
+    '.png': 'image/png',
+    '.gif': 'image/gif',
+    '.webp': 'image/webp',
+    '.pdf': 'application/pdf'
+}
+
+
+def _downscale_image(image_path: str) -> Optional[bytes]:
+    """Downscale an image to Claude's useful resolution and re-encode as JPEG.
+
+    Args:
+        image_path: Path to the image file
+
+    Returns:
+        JPEG bytes, or None if the image is already small enough
+    """
+    with Image.open(image_path) as img:
+        width, height = img.size
+        scale = min(
+            image_config.max_long_edge / max(width, height),
+            (image_config.max_pixels / (width * height)) ** 0.5
+        )
+        if scale >= 1:
+            return None
+        img.thumbnail((int(width * scale), int(height * scale)), Image.LANCZOS)
+        buffer = io.BytesIO()
+        img.convert("RGB").save(buffer, "JPEG", quality=image_config.jpeg_quality, optimize=True)
+    return buffer.getvalue()
+
+
+@lru_cache(maxsize=64)
+def _downscaled_image(image_path: str, mtime_ns: int, size: int) -> Optional[bytes]:
+    """Downscale an image file once per process.
+
+    mtime_ns and size are only part of the cache key, so a file that changes
+    on disk is downscaled again. Only downscaled JPEGs, bounded by
+    image_config.max_pixels, are held in memory; images that are already
+    small enough are cached as None and read from disk when encoded. With
+    image_config.cache_enabled the JPEGs are also kept in the on-disk image
+    cache so they survive across runs.
+
+    Returns:
+        JPEG bytes, or None if the image is already small enough
+    """
+    if image_config.cache_enabled:
+        cached = get_image_cache().get(image_path, mtime_ns, size)
+        if cached is not None:
+            return cached
+
+    optimized = _downscale_image(image_path)
+    if optimized is not None and image_config.cache_enabled:
+        get_image_cache().set(image_path, mtime_ns, size, optimized)
+    return optimized
+
+
+def _encode_image_file(image_path: str, mtime_ns: int, size: int, optimize_images: bool) -> Tuple[str, str]:
+    """Read, optionally downscale, and base64 encode an image file.
+
+    Returns:
+        Tuple of (base64_encoded_data, media_type)
+    """
+    media_type = MEDIA_TYPES.get(Path(image_path).suffix.lower(), 'image/jpeg')
+    optimized = None
+    if optimize_images and media_type != 'application/pdf':
+        optimized = _downscaled_image(image_path, mtime_ns, size)
+
+    if optimized is not None:
+        return base64.b64encode(optimized).decode('utf-8'), 'image/jpeg'
+    with open(image_path, "rb") as image_file:
+        return base64.b64encode(image_file.read()).decode('utf-8'), media_type
+
+
+def _file_digest(path: str) -> Optional[bytes]:
+    """Hash a file's contents to find identical images within a batch.
+
+    Args:
+        path: Path to the file
+
+    Returns:
+        16-byte BLAKE2b digest, or None if the file cannot be read
+    """
+    try:
+        with open(path, "rb") as f:
+            return hashlib.file_digest(f, lambda: hashlib.blake2b(digest_size=16)).digest()
+    except OSError:
+        return None
+
+
+def _cached_message(usage: Optional[Dict]):
+    """Stand in for the Message behind a response served from the cache.
+
+    It carries the token usage of the request that produced the response,
+    so calculate_cost() still reports what the work cost.
+    """
+    return SimpleNamespace(usage=usage) if usage is not None else None
+
+
+@lru_cache(maxsize=8)
+def _split_template(prompt_file: str, placeholder: str) -> Tuple[str, str]:
+    """Load a prompt template and split it around a placeholder.
+
+    Args:
+        prompt_file: Name of the prompt file
+        placeholder: The placeholder to split on
+
+    Returns:
+        Tuple of (text before the placeholder, text after it)
+    """
+    head, _, tail = prompt_manager.load_template(prompt_file).partition(placeholder)
+    return head, tail
+
+
+def _dublin_core_row(element: str, data) -> Optional[Tuple]:
+    """Build a metadata CSV row for a Dublin Core element.
+
+    Args:
+        element: The Dublin Core element name
+        data: The element's analysis from Claude
+
+    Returns:
+        Row tuple, or None if the element has no value
+    """
+    if not isinstance(data, dict):
+        return None
+    value = data.get('value')
+    if not value:
+        return None
+    authority = data.get('authority', '')
+    return (
+        'dublin_core',
+        element,
+        '; '.join(map(str, value)) if isinstance(value, list) else str(value),
+        data.get('confidence', ''),
+        '; '.join(authority) if isinstance(authority, list) else authority,
+        data.get('reasoning', ''),
+        data.get('source_metadata', '')
+    )
+
+
+def _find_files(paths: List[Optional[str]]) -> List[Optional[str]]:
+    """Find the file for each path, listing each directory once.
+
+    Batches usually keep their images in a few directories, so one
+    os.scandir per directory replaces a stat or failed open per item.
+    File names are matched exactly first and then ignoring case, since
+    spreadsheets often name "IMG_01.jpg" for a file saved as "IMG_01.JPG".
+
+    Args:
+        paths: File paths (None or empty counts as missing)
+
+    Returns:
+        list: The path of each file as it is named on disk, or None if missing
+    """
+    by_dir = defaultdict(dict)
+    for path in filter(None, paths):
+        by_dir[os.path.dirname(os.path.abspath(path))]
+    for directory, names in by_dir.items():
+        try:
+            with os.scandir(directory) as entries:
+                files = [entry.name for entry in entries if entry.is_file()]
+        except OSError:
+            continue
+        # Exact names are added last so they win over a case-folded match
+        names.update((name.casefold(), name) for name in files)
+        names.update((name, name) for name in files)
+
+    found = []
+    for path in paths:
+        name = None
+        if path:
+            directory, requested = os.path.split(path)
+            names = by_dir[os.path.dirname(os.path.abspath(path))]
+            name = names.get(requested) or names.get(requested.casefold())
+            if name is not None:
+                name = os.path.join(directory, name)
+        found.append(name)
+    return found
+
+
+def _missing_image_error(path: Optional[str]) -> str:
+    """Describe why an article's image could not be found.
+
+    Args:
+        path: The image path the article asked for
+
+    Returns:
+        str: The error message
+    """
+    return f"Image not found: {path}" if path else "No image path provided for analysis"
+
+
+@lru_cache(maxsize=None)
+def _flag_label(flag_type: str) -> str:
+    """Display label for a review flag key, e.g. 'needs_research' -> 'Needs Research'."""
+    return flag_type.replace('_', ' ').title()
+
+
+@lru_cache(maxsize=None)
+def _element_heading(element: str) -> str:
+    """Display heading for a metadata element key, e.g. 'date_created' -> 'DATE CREATED'."""
+    return element.upper().replace('_', ' ')
+
+
+def _topical_facet_extra(data: Dict) -> Tuple[List[str], str]:
+    """Extra report lines and CSV info for the FAST topical facet."""
+    lines = []
+    if data.get('primary_concepts'):
+        lines.append(f"  Primary Concepts: {'; '.join(data['primary_concepts'])}")
+    if data.get('secondary_concepts'):
+        lines.append(f"  Secondary Concepts: {'; '.join(data['secondary_concepts'])}")
+    primary = data.get('primary_concepts', [])
+    return lines, f"Primary: {'; '.join(primary)}" if primary else ''
+
+
+def _scope_facet_extra(label: str, field: str):
+    """Build the extra report lines and CSV info for a facet with a scope field."""
+    def extra(data: Dict) -> Tuple[List[str], str]:
+        scope = data.get(field, '')
+        return ([f"  {label}: {scope}"] if scope else []), scope
+    return extra
+
+
+def _no_facet_extra(data: Dict) -> Tuple[List[str], str]:
+    """Facets without extra details."""
+    return [], ''
 
 
 class ClaudeBase:
     """Base class for Claude API requests with common functionality."""
 
+    # Prompt templates keep per-item data in a trailing section starting here
+    PROMPT_CACHE_BOUNDARY = "## Existing Metadata:"
+
     def __init__(self, api_key: Optional[str] = None, model: Optional[str] = None):
         """Initialize Claude client.
 
@@ -25,11 +309,26 @@ class ClaudeBase:
             api_key: Anthropic API key (defaults to CLAUDE_API environment variable)
             model: Model to use (defaults to config.model_config.default_model)
         """
-        self.client = anthropic.Anthropic(
-            api_key=api_key or os.environ.get("CLAUDE_API")
-        )
+        self.api_key = api_key
+        self.client = get_client(api_key)
         self.model = model or model_config.default_model
 
+    def get_async_client(self) -> anthropic.AsyncAnthropic:
+        """Create an async Anthropic client for concurrent batch requests.
+
+        Async clients are bound to the event loop they run on, so a new one
+        is created for each batch instead of being cached like get_client().
+
+        Returns:
+            anthropic.AsyncAnthropic client
+        """
+        return anthropic.AsyncAnthropic(
+            api_key=self.api_key or os.environ.get("CLAUDE_API"),
+            timeout=_http_timeout(),
+            max_retries=http_config.max_retries,
+            http_client=anthropic.DefaultAsyncHttpxClient(**_http_client_options())
+        )
+
     def get_prompt(self, prompt_file: str, **kwargs) -> str:
         """Load and optionally render a prompt template.
 
@@ -49,29 +348,26 @@ class ClaudeBase:
             return prompt_manager.load_and_render(prompt_file, **kwargs)
         return prompt_manager.load_template(prompt_file)
 
-    def encode_image(self, image_path: str) -> Tuple[str, str]:
+    def encode_image(self, image_path: str, optimize_images: Optional[bool] = None) -> Tuple[str, str]:
         """Encode an image to base64 and determine its media type.
 
+        Images larger than image_config.max_long_edge or image_config.max_pixels
+        are downscaled and re-encoded as JPEG, which cuts both upload size and
+        vision tokens. Results are cached until the file changes.
+
         Args:
             image_path: Path to the image file
+            optimize_images: Downscale large images before encoding
+                (defaults to config.image_config.optimize_images)
 
         Returns:
             Tuple of (base64_encoded_data, media_type)
         """
-        with open(image_path, "rb") as image_file:
-            image_data = base64.b64encode(image_file.read()).decode('utf-8')
-
-        suffix = Path(image_path).suffix.lower()
-        media_type_map = {
-            '.jpg': 'image/jpeg',
-            '.jpeg': 'image/jpeg',
-            '.png': 'image/png',
-            '.gif': 'image/gif',
-            '.webp': 'image/webp'
-        }
-        media_type = media_type_map.get(suffix, 'image/jpeg')
+        if optimize_images is None:
+            optimize_images = image_config.optimize_images
 
-        return image_data, media_type
+        stat = os.stat(image_path)
+        return _encode_image_file(os.path.abspath(image_path), stat.st_mtime_ns, stat.st_size, optimize_images)
 
     def parse_response(self, response_text: str, format_hint: str = "auto") -> Dict:
         """Parse Claude API response in TOON or JSON format.
@@ -85,6 +381,82 @@ class ClaudeBase:
         """
         return ResponseParser.parse_response(response_text, format_hint)
 
+    def _build_content(self, prompt: str, image_block: Optional[Dict] = None) -> List[Dict]:
+        """Build message content that lets Claude cache the static prompt prefix.
+
+        The prompt is split at PROMPT_CACHE_BOUNDARY. The instructions before it
+        are identical for every item in a batch and are marked as a prompt
+        cache breakpoint. The image and the per-item section follow, so they
+        do not invalidate the cached prefix.
+
+        Args:
+            prompt: The rendered prompt
+            image_block: Optional image content block
+
+        Returns:
+            List of content blocks for a user message
+        """
+        static, boundary, dynamic = prompt.partition(self.PROMPT_CACHE_BOUNDARY)
+        image_blocks = [image_block] if image_block else []
+        if not boundary:
+            return image_blocks + [{"type": "text", "text": prompt}]
+        return [
+            {"type": "text", "text": static, "cache_control": {"type": "ephemeral"}},
+            *image_blocks,
+            {"type": "text", "text": boundary + dynamic}
+        ]
+
+    def _parse_metadata(self, response_text: str) -> Dict:
+        """Parse a metadata response, returning an error dict if parsing fails.
+
+        Args:
+            response_text: Raw response text from Claude
+
+        Returns:
+            Parsed dictionary, or {"error": ...}
+        """
+        try:
+            return self.parse_response(response_text, format_hint="toon")
+        except Exception as e:
+            print(f"Parse error in metadata: {e}")
+            return {"error": f"Could not parse response: {e}"}
+
+    @staticmethod
+    def _format_flags(metadata: Dict) -> List[str]:
+        """Format the review flags section of a readable report.
+
+        Args:
+            metadata: The metadata analysis from Claude
+
+        Returns:
+            Report lines, empty if nothing was flagged
+        """
+        flags = metadata.get('flags', {})
+        if not any(flags.values()):
+            return []
+
+        output = [f"\n{'=' * 40}", "REVIEW REQUIRED:", f"{'=' * 40}"]
+        for flag_type, items in flags.items():
+            if items:
+                output.append(f"\n{_flag_label(flag_type)}:")
+                output.extend(f"  • {item}" for item in items)
+        return output
+
+    @staticmethod
+    def _append_summary(summary_file, record: Dict) -> Dict:
+        """Append a record to an NDJSON batch summary and flush it to disk.
+
+        Args:
+            summary_file: Summary file opened in binary mode
+            record: The batch result to write
+
+        Returns:
+            dict: The record, unchanged
+        """
+        summary_file.write(orjson.dumps(record) + b"\n")
+        summary_file.flush()
+        return record
+
     def save_json(self, data: Dict, output_path: str, include_timestamp: bool = True) -> str:
         """Save data as JSON file.
 
@@ -102,16 +474,27 @@ class ClaudeBase:
         else:
             json_path = f"{output_path}.json"
 
-        with open(json_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        self._write_json(data, json_path)
 
         return json_path
 
+    @staticmethod
+    def _write_json(data, json_path: str):
+        """Write data to a UTF-8 JSON file with two-space indentation.
+
+        Args:
+            data: JSON-serializable data to write
+            json_path: Path of the file to write
+        """
+        with open(json_path, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+
     def calculate_cost(self, usage_data=None, model_name=None):
         """Calculate cost based on token usage and model.
 
         Args:
-            usage_data (dict, optional): Token usage data with 'input_tokens' and 'output_tokens'.
+            usage_data (dict or Usage, optional): Token usage with 'input_tokens' and 'output_tokens',
+                                       as a dict or an object exposing them as attributes.
                                        If None, uses self.last_response.usage
             model_name (str, optional): Model name. If None, uses self.model_used
 
@@ -169,7 +552,7 @@ class ClaudeBase:
         # Determine usage data
         if usage_data is None:
             if hasattr(self, 'last_response') and self.last_response:
-                usage_data = self.last_response.usage.__dict__
+                usage_data = self.last_response.usage
             else:
                 raise ValueError("No usage data provided and no last_response available")
 
@@ -187,15 +570,26 @@ class ClaudeBase:
                            f"Available models: {available_models}")
 
         # Extract token counts
-        input_tokens = usage_data.get('input_tokens', 0)
-        output_tokens = usage_data.get('output_tokens', 0)
+        if isinstance(usage_data, dict):
+            input_tokens = usage_data.get('input_tokens', 0)
+            output_tokens = usage_data.get('output_tokens', 0)
+            cache_write_tokens = usage_data.get('cache_creation_input_tokens') or 0
+            cache_read_tokens = usage_data.get('cache_read_input_tokens') or 0
+        else:
+            input_tokens = getattr(usage_data, 'input_tokens', 0)
+            output_tokens = getattr(usage_data, 'output_tokens', 0)
+            cache_write_tokens = getattr(usage_data, 'cache_creation_input_tokens', None) or 0
+            cache_read_tokens = getattr(usage_data, 'cache_read_input_tokens', None) or 0
 
         if input_tokens == 0 and output_tokens == 0:
             raise ValueError("Both input_tokens and output_tokens are 0")
 
         # Calculate costs (pricing is per million tokens)
+        # Prompt cache writes cost 1.25x the input price and reads 0.1x
         pricing = model_pricing[model_name]
-        input_cost = (input_tokens / 1_000_000) * pricing['input']
+        input_cost = (
+            (input_tokens + cache_write_tokens * 1.25 + cache_read_tokens * 0.1) / 1_000_000
+        ) * pricing['input']
         output_cost = (output_tokens / 1_000_000) * pricing['output']
         total_cost = input_cost + output_cost
 
@@ -203,6 +597,8 @@ class ClaudeBase:
             'model': model_name,
             'input_tokens': input_tokens,
             'output_tokens': output_tokens,
+            'cache_write_tokens': cache_write_tokens,
+            'cache_read_tokens': cache_read_tokens,
             'input_cost_usd': round(input_cost, 6),
             'output_cost_usd': round(output_cost, 6),
             'total_cost_usd': round(total_cost, 6),
@@ -212,6 +608,197 @@ class ClaudeBase:
             }
         }
 
+    @staticmethod
+    def _semantic_cache():
+        """Get the semantic cache if it is enabled and available, else None."""
+        if cache_config.enabled and cache_config.semantic_enabled:
+            return get_semantic_cache()
+        return None
+
+    def _cache_lookup(self, cache_key: bytes, semantic: Optional[Tuple] = None) -> Optional[Tuple[str, Dict]]:
+        """Look up a cached response for a request.
+
+        Args:
+            cache_key: Key from response_cache.make_key() for the exact request
+            semantic: Optional (scope, text) pair for a near-duplicate lookup,
+                optionally followed by the text's precomputed embedding
+
+        Returns:
+            Tuple of (response_text, usage of the original request) or None
+        """
+        if not cache_config.enabled:
+            return None
+        cached = get_response_cache().get(cache_key)
+        if cached is not None:
+            return cached
+        semantic_cache = self._semantic_cache()
+        if semantic and semantic_cache is not None:
+            return semantic_cache.get(*semantic[:2], embedding=semantic[2] if len(semantic) > 2 else None)
+        return None
+
+    def _cache_store(self, cache_key: bytes, response, semantic: Optional[Tuple] = None):
+        """Store a response so identical requests are not sent again.
+
+        Args:
+            cache_key: Key from response_cache.make_key() for the exact request
+            response: Anthropic API response object
+            semantic: Optional (scope, text) pair for the near-duplicate index,
+                optionally followed by the text's precomputed embedding
+        """
+        if not cache_config.enabled:
+            return
+        response_text = response.content[0].text.strip()
+        usage = response.usage.to_dict()
+        get_response_cache().set(cache_key, response_text, usage)
+        semantic_cache = self._semantic_cache()
+        if semantic and semantic_cache is not None:
+            semantic_cache.set(*semantic[:2], response_text,
+                               embedding=semantic[2] if len(semantic) > 2 else None, usage=usage)
+
+    def _create_message(self, cache_key: bytes, semantic: Optional[Tuple] = None, **request) -> str:
+        """Send a messages request unless the response is already cached.
+
+        Args:
+            cache_key: Key from response_cache.make_key() for the request
+            semantic: Optional (scope, text) pair for a near-duplicate lookup
+            **request: Arguments for client.messages.create
+
+        Returns:
+            Response text from Claude
+        """
+        cached = self._cache_lookup(cache_key, semantic)
+        if cached is not None:
+            # Costs are reported from the request that produced the response
+            self._store_response_data(_cached_message(cached[1]), request["model"])
+            return cached[0]
+
+        response = self.client.messages.create(**request)
+        self._store_response_data(response, request["model"])
+        self._cache_store(cache_key, response, semantic)
+        return response.content[0].text.strip()
+
+    async def _create_message_async(self, client: anthropic.AsyncAnthropic, cache_key: bytes,
+                                    semantic: Optional[Tuple] = None, **request) -> str:
+        """Async variant of _create_message.
+
+        Args:
+            client: The async client to send the request with
+            cache_key: Key from response_cache.make_key() for the request
+            semantic: Optional (scope, text) pair for a near-duplicate lookup
+            **request: Arguments for client.messages.create
+
+        Returns:
+            Response text from Claude
+        """
+        cached = self._cache_lookup(cache_key, semantic)
+        if cached is not None:
+            self._store_response_data(_cached_message(cached[1]), request["model"])
+            return cached[0]
+
+        response = await client.messages.create(**request)
+        self._store_response_data(response, request["model"])
+        self._cache_store(cache_key, response, semantic)
+        return response.content[0].text.strip()
+
+    def _create_message_batch(self, requests: List[Tuple[bytes, Dict]],
+                              semantic: Optional[List[Tuple]] = None,
+                              messages: Optional[Dict] = None) -> List:
+        """Send requests through the Message Batches API and wait for the results.
+
+        Batched requests are billed at half the standard token price but can
+        take up to 24 hours to finish. Cached and repeated requests are only
+        resolved once, and near-duplicates are looked up in one index search.
+
+        Args:
+            requests: (cache_key, client.messages.create arguments) pairs
+            semantic: Optional (scope, text, embedding) for each request,
+                for near-duplicate lookups
+            messages: Optional dict to fill with the Message for each request
+                the batch or the response cache answered, keyed by the cache
+                key's hex digest, for cost accounting
+
+        Returns:
+            list: Response text for each request in order, or an Exception
+                for requests that did not succeed
+        """
+        responses = {}
+        pending = {}
+        for n, (cache_key, params) in enumerate(requests):
+            custom_id = cache_key.hex()
+            if custom_id in responses or custom_id in pending:
+                continue
+            cached = self._cache_lookup(cache_key)
+            if cached is not None:
+                responses[custom_id] = cached[0]
+                if messages is not None:
+                    messages[custom_id] = _cached_message(cached[1])
+            else:
+                pending[custom_id] = (cache_key, params, semantic[n] if semantic else None)
+
+        semantic_cache = self._semantic_cache()
+        if semantic and semantic_cache is not None and pending:
+            ids = list(pending)
+            hits = semantic_cache.get_many(
+                [pending[custom_id][2][0] for custom_id in ids],
+                [pending[custom_id][2][2] for custom_id in ids]
+            )
+            for custom_id, hit in zip(ids, hits):
+                if hit is not None:
+                    responses[custom_id] = hit[0]
+                    if messages is not None:
+                        messages[custom_id] = _cached_message(hit[1])
+                    del pending[custom_id]
+
+        batch_ids = []
+        chunk, chunk_bytes = [], 0
+        for custom_id, (_, params, _) in pending.items():
+            size = len(orjson.dumps(params))
+            if chunk and (len(chunk) >= message_batch_config.max_requests
+                          or chunk_bytes + size > message_batch_config.max_bytes):
+                batch_ids.append(self._submit_message_batch(chunk))
+                chunk, chunk_bytes = [], 0
+            chunk.append({"custom_id": custom_id, "params": params})
+            chunk_bytes += size
+        if chunk:
+            batch_ids.append(self._submit_message_batch(chunk))
+
+        for batch_id in batch_ids:
+            batch = self.client.messages.batches.retrieve(batch_id)
+            while batch.processing_status != "ended":
+                time.sleep(message_batch_config.poll_interval)
+                batch = self.client.messages.batches.retrieve(batch_id)
+
+            for entry in self.client.messages.batches.results(batch_id):
+                result = entry.result
+                if result.type == "succeeded":
+                    cache_key, _, request_semantic = pending[entry.custom_id]
+                    self._cache_store(cache_key, result.message, request_semantic)
+                    responses[entry.custom_id] = result.message.content[0].text.strip()
+                    if messages is not None:
+                        messages[entry.custom_id] = result.message
+                elif result.type == "errored":
+                    responses[entry.custom_id] = RuntimeError(result.error.error.message)
+                else:
+                    responses[entry.custom_id] = RuntimeError(f"Batch request {result.type}")
+
+        return [
+            responses.get(cache_key.hex(), RuntimeError("No result returned for batch request"))
+            for cache_key, _ in requests
+        ]
+
+    def _submit_message_batch(self, requests: List[Dict]) -> str:
+        """Submit one Message Batches API batch.
+
+        Args:
+            requests: Batch entries with 'custom_id' and 'params' keys
+
+        Returns:
+            str: The batch ID
+        """
+        batch = self.client.messages.batches.create(requests=requests)
+        print(f"Submitted message batch {batch.id} with {len(requests)} requests")
+        return batch.id
+
     def _store_response_data(self, response, model_name):
         """Helper method to store response data for cost calculation.
 
@@ -229,6 +816,35 @@ class ClaudePage(ClaudeBase):
     def __init__(self, api_key: Optional[str] = None, model: Optional[str] = None):
         super().__init__(api_key, model)
         self.prompt = self.get_prompt("htr")
+        # Model, max_tokens and prompt are fixed for every page, so build them once
+        self._payload_template = {
+            "model": self.model,
+            "max_tokens": model_config.get_max_tokens('htr')
+        }
+        self._prompt_block = {"type": "text", "text": self.prompt}
+
+    def _build_payload(self, image_data: str, media_type: str) -> Dict:
+        """Build the request payload for a page, splicing its image into the template.
+
+        Args:
+            image_data (str): Base64 encoded image
+            media_type (str): Media type of the image
+
+        Returns:
+            dict: Keyword arguments for client.messages.create
+        """
+        image_block = {
+            "type": "image",
+            "source": {
+                "type": "base64",
+                "media_type": media_type,
+                "data": image_data
+            }
+        }
+        return {
+            **self._payload_template,
+            "messages": [{"role": "user", "content": [image_block, self._prompt_block]}]
+        }
 
     def extract_text_with_claude(self, image_path: str) -> Tuple[str, Dict]:
         """Uses Claude AI to extract the contents of a handwritten document
@@ -242,29 +858,7 @@ class ClaudePage(ClaudeBase):
         try:
             image_data, media_type = self.encode_image(image_path)
 
-            message = self.client.messages.create(
-                model=self.model,
-                max_tokens=model_config.get_max_tokens('htr'),
-                messages=[
-                    {
-                        "role": "user",
-                        "content": [
-                            {
-                                "type": "image",
-                                "source": {
-                                    "type": "base64",
-                                    "media_type": media_type,
-                                    "data": image_data
-                                }
-                            },
-                            {
-                                "type": "text",
-                                "text": self.prompt
-                            }
-                        ]
-                    }
-                ]
-            )
+            message = self.client.messages.create(**self._build_payload(image_data, media_type))
 
             # Store response data for cost calculation
             self._store_response_data(message, self.model)
@@ -343,31 +937,43 @@ class ClaudeWork(ClaudeBase):
         try:
             model_to_use = model or self.model
 
-            response = self.client.messages.create(
-                model=model_to_use,
-                max_tokens=model_config.get_max_tokens('metadata'),
-                messages=[
-                    {"role": "user", "content": self.prompt}
-                ]
-            )
+            response = self.client.messages.create(**self._metadata_request(model_to_use))
 
             # Store the Cost
             self._store_response_data(response, model_to_use)
 
             response_text = response.content[0].text.strip()
-
-            # Parse response using unified parser (handles TOON format)
-            try:
-                metadata = self.parse_response(response_text, format_hint="toon")
-                metadata['filenames'] = self.pages
-                return response_text, metadata
-            except Exception as e:
-                print(f"Parse error in metadata: {e}")
-                return response_text, {"error": f"Could not parse response: {e}"}
+            return response_text, self._metadata_from_response(response_text)
 
         except Exception as e:
             print(f"Error getting metadata: {str(e)}")
             return "", {"error": str(e)}
+
+    def _metadata_request(self, model: str) -> Dict:
+        """Build the metadata request for a model.
+
+        Returns:
+            dict: Keyword arguments for client.messages.create
+        """
+        return {
+            "model": model,
+            "max_tokens": model_config.get_max_tokens('metadata'),
+            "messages": [{"role": "user", "content": self.prompt}]
+        }
+
+    def _metadata_from_response(self, response_text: str) -> Dict:
+        """Parse a metadata response (TOON format) and add the work's filenames.
+
+        Returns:
+            dict: The metadata, or an 'error' entry if it could not be parsed
+        """
+        try:
+            metadata = self.parse_response(response_text, format_hint="toon")
+            metadata['filenames'] = self.pages
+            return metadata
+        except Exception as e:
+            print(f"Parse error in metadata: {e}")
+            return {"error": f"Could not parse response: {e}"}
     
     def save_metadata(self, metadata: Dict, output_path: str = "metadata"):
         """Save metadata as JSON.
@@ -409,31 +1015,42 @@ class ClaudeAV(ClaudeBase):
         try:
             model_to_use = model or self.model
 
-            response = self.client.messages.create(
-                model=model_to_use,
-                max_tokens=model_config.get_max_tokens('av'),
-                messages=[
-                    {"role": "user", "content": self.prompt}
-                ]
-            )
+            response = self.client.messages.create(**self._metadata_request(model_to_use))
 
             # Store the Cost
             self._store_response_data(response, model_to_use)
 
             response_text = response.content[0].text.strip()
-
-            # Parse response using unified parser (handles TOON format)
-            try:
-                metadata = self.parse_response(response_text, format_hint="toon")
-                return response_text, metadata
-            except Exception as e:
-                print(f"Parse error in metadata: {e}")
-                return response_text, {"error": f"Could not parse response: {e}"}
+            return response_text, self._metadata_from_response(response_text)
 
         except Exception as e:
             print(f"Error getting metadata: {str(e)}")
             return "", {"error": str(e)}
 
+    def _metadata_request(self, model: str) -> Dict:
+        """Build the metadata request for a model.
+
+        Returns:
+            dict: Keyword arguments for client.messages.create
+        """
+        return {
+            "model": model,
+            "max_tokens": model_config.get_max_tokens('av'),
+            "messages": [{"role": "user", "content": self.prompt}]
+        }
+
+    def _metadata_from_response(self, response_text: str) -> Dict:
+        """Parse a metadata response (TOON format).
+
+        Returns:
+            dict: The metadata, or an 'error' entry if it could not be parsed
+        """
+        try:
+            return self.parse_response(response_text, format_hint="toon")
+        except Exception as e:
+            print(f"Parse error in metadata: {e}")
+            return {"error": f"Could not parse response: {e}"}
+
     def save_metadata(self, metadata: Dict, output_path: str = "metadata"):
         """Save metadata as JSON.
 
@@ -453,6 +1070,46 @@ class ClaudeAV(ClaudeBase):
         return json_path
     
 
+def batch_get_metadata(works: List[ClaudeBase], model: Optional[str] = None) -> List[Tuple[str, Dict]]:
+    """Get metadata for many ClaudeWork or ClaudeAV objects through the Message Batches API.
+
+    Equivalent to calling get_metadata() on each work, at half the token
+    price, but blocks until the batch finishes, which can take up to 24
+    hours. Each work's response data is set from its batch result, so
+    calculate_cost() still works (at the standard price). Works answered
+    from the response cache report the cost of the request that produced
+    the cached response; repeats of an identical request in the same batch
+    have no cost.
+
+    Args:
+        works (list): ClaudeWork or ClaudeAV objects
+        model (Optional[str]): The Claude Model to Use (defaults to each work's model)
+
+    Returns:
+        list: (response text, metadata) for each work, in order
+    """
+    if not works:
+        return []
+    requests = []
+    for work in works:
+        params = work._metadata_request(model or work.model)
+        requests.append((make_key(work.prompt, params["model"]), params))
+
+    messages = {}
+    responses = works[0]._create_message_batch(requests, messages=messages)
+
+    results = []
+    for work, (cache_key, params), response in zip(works, requests, responses):
+        if isinstance(response, Exception):
+            print(f"Error getting metadata: {str(response)}")
+            results.append(("", {"error": str(response)}))
+            continue
+        # Only the first of identical requests is billed
+        work._store_response_data(messages.pop(cache_key.hex(), None), params["model"])
+        results.append((response, work._metadata_from_response(response)))
+    return results
+
+
 class ClaudeImage(ClaudeBase):
     """Class to represent an Image or Map with existing metadata for Claude analysis
     
@@ -481,15 +1138,19 @@ class ClaudeImage(ClaudeBase):
         self.material_type = material_type.upper()
         self.prompt = self._format_prompt()
 
-    def _format_prompt(self):
+    def _format_prompt(self, existing_metadata: Optional[str] = None, material_type: Optional[str] = None):
         """Format the prompt with existing metadata and material type
 
+        Args:
+            existing_metadata (Optional[str]): Metadata to insert (defaults to self.existing_metadata)
+            material_type (Optional[str]): Material type to insert (defaults to self.material_type)
+
         Returns:
             str: The formatted prompt ready for Claude
         """
         return self.get_prompt("maps",
-                              existing_metadata=self.existing_metadata,
-                              material_type=self.material_type)
+                              existing_metadata=self.existing_metadata if existing_metadata is None else existing_metadata,
+                              material_type=material_type or self.material_type)
 
     def load_metadata_from_file(self, filepath: str, encoding: str = 'utf-8'):
         """Load existing metadata from a file
@@ -521,28 +1182,6 @@ class ClaudeImage(ClaudeBase):
         self.existing_metadata = metadata_text
         self.prompt = self._format_prompt()
 
-    def encode_image(self, image_path: str) -> Tuple[str, str]:
-        """Gets an image and returns a tuple with base64 encoding of the file contents and its media type
-        
-        Args:
-            image_path (str): The path to an image
-
-        Returns:
-            tuple: base64 encoded image contents, media type
-        """
-        with open(image_path, "rb") as image_file:
-            image_data = base64.b64encode(image_file.read()).decode('utf-8')
-        suffix = Path(image_path).suffix.lower()
-        media_type_map = {
-            '.jpg': 'image/jpeg',
-            '.jpeg': 'image/jpeg',
-            '.png': 'image/png',
-            '.gif': 'image/gif',
-            '.webp': 'image/webp'
-        }
-        media_type = media_type_map.get(suffix, 'image/jpeg')
-        return image_data, media_type
-
     def analyze_image_with_metadata(self, image_path: str, model: str = None) -> Tuple[str, Dict]:
         """Analyzes an image along with existing metadata to suggest Dublin Core elements
         
@@ -568,20 +1207,14 @@ class ClaudeImage(ClaudeBase):
                 messages=[
                     {
                         "role": "user",
-                        "content": [
-                            {
-                                "type": "image",
-                                "source": {
-                                    "type": "base64",
-                                    "media_type": media_type,
-                                    "data": image_data
-                                }
-                            },
-                            {
-                                "type": "text",
-                                "text": self.prompt
+                        "content": self._build_content(self.prompt, {
+                            "type": "image",
+                            "source": {
+                                "type": "base64",
+                                "media_type": media_type,
+                                "data": image_data
                             }
-                        ]
+                        })
                     }
                 ]
             )
@@ -620,27 +1253,58 @@ class ClaudeImage(ClaudeBase):
             
         if not self.existing_metadata.strip():
             return "", {"error": "No existing metadata provided for analysis"}
-            
+            
+        try:
+            response_text = self._create_message(
+                make_key(self.prompt, model),
+                model=model,
+                max_tokens=3000,
+                messages=[
+                    {"role": "user", "content": self._build_content(self.prompt)}
+                ]
+            )
+
+            # Parse response using unified parser (handles TOON format)
+            return response_text, self._parse_metadata(response_text)
+
+        except Exception as e:
+            print(f"Error getting metadata analysis: {str(e)}")
+            return "", {"error": str(e)}
+
+    async def _get_dublin_core_analysis_async(self, client: anthropic.AsyncAnthropic, existing_metadata: str,
+                                              material_type: str, model: str = None) -> Tuple[str, Dict]:
+        """Async variant of get_dublin_core_analysis for concurrent batches
+
+        Builds the prompt from its arguments instead of instance state, so
+        several records can be analyzed at once by the same ClaudeImage.
+
+        Args:
+            client (anthropic.AsyncAnthropic): The async client to send the request with
+            existing_metadata (str): The existing metadata text to analyze
+            material_type (str): Type of material - MAP, PHOTOGRAPH, etc.
+            model (str): The Claude Model to Use (defaults to self.model)
+
+        Returns:
+            tuple: str (the response from Claude), dict (the metadata analysis)
+        """
+        if model is None:
+            model = self.model
+
+        if not existing_metadata.strip():
+            return "", {"error": "No existing metadata provided for analysis"}
+
         try:
-            response = self.client.messages.create(
+            prompt = self._format_prompt(existing_metadata, material_type)
+            response_text = await self._create_message_async(
+                client,
+                make_key(prompt, model),
                 model=model,
                 max_tokens=3000,
                 messages=[
-                    {"role": "user", "content": self.prompt}
+                    {"role": "user", "content": self._build_content(prompt)}
                 ]
             )
-            
-            self._store_response_data(response, model)
-
-            response_text = response.content[0].text.strip()
-
-            # Parse response using unified parser (handles TOON format)
-            try:
-                metadata = self.parse_response(response_text, format_hint="toon")
-                return response_text, metadata
-            except Exception as e:
-                print(f"Parse error in metadata: {e}")
-                return response_text, {"error": f"Could not parse response: {e}"}
+            return response_text, self._parse_metadata(response_text)
 
         except Exception as e:
             print(f"Error getting metadata analysis: {str(e)}")
@@ -676,7 +1340,7 @@ class ClaudeImage(ClaudeBase):
         
         for element, data in dc.items():
             if isinstance(data, dict) and data.get('value'):
-                output.append(f"\n{element.upper().replace('_', ' ')}:")
+                output.append(f"\n{_element_heading(element)}:")
                 value = data['value']
                 if isinstance(value, list):
                     output.append(f"  Value: {'; '.join(str(v) for v in value)}")
@@ -705,7 +1369,7 @@ class ClaudeImage(ClaudeBase):
             
             for element, data in specialized.items():
                 if isinstance(data, dict) and data.get('value'):
-                    output.append(f"\n{element.upper().replace('_', ' ')}:")
+                    output.append(f"\n{_element_heading(element)}:")
                     output.append(f"  Value: {data['value']}")
                     output.append(f"  Confidence: {data.get('confidence', 'unknown')}")
                     if data.get('reasoning'):
@@ -719,34 +1383,25 @@ class ClaudeImage(ClaudeBase):
             
             for element, data in additional.items():
                 if isinstance(data, dict) and data.get('value'):
-                    output.append(f"\n{element.upper().replace('_', ' ')}:")
+                    output.append(f"\n{_element_heading(element)}:")
                     output.append(f"  Value: {data['value']}")
                     output.append(f"  Confidence: {data.get('confidence', 'unknown')}")
                     if data.get('reasoning'):
                         output.append(f"  Reasoning: {data['reasoning']}")
         
-        flags = metadata.get('flags', {})
-        if any(flags.values()):
-            output.append(f"\n{'=' * 40}")
-            output.append("REVIEW REQUIRED:")
-            output.append(f"{'=' * 40}")
-            
-            for flag_type, items in flags.items():
-                if items:
-                    output.append(f"\n{flag_type.replace('_', ' ').title()}:")
-                    for item in items:
-                        output.append(f"  • {item}")
+        output.extend(self._format_flags(metadata))
         
         return "\n".join(output)
     
     def save_analysis(self, metadata: Dict, output_path: str = "image_metadata_analysis", 
-                     formats: List[str] = ["json", "readable"]):
+                     formats: List[str] = ["json", "readable"], material_type: Optional[str] = None):
         """Save metadata analysis in various formats
         
         Args:
             metadata (dict): The metadata analysis from Claude
             output_path (str): Base path for output files
             formats (list): The formats to save ("json", "readable", "csv")
+            material_type (Optional[str]): Material type for the filenames (defaults to self.material_type)
 
         Returns:
             None
@@ -756,12 +1411,11 @@ class ClaudeImage(ClaudeBase):
             return
         
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        material_suffix = self.material_type.lower()
+        material_suffix = (material_type or self.material_type).lower()
         
         if "json" in formats:
             json_path = f"{output_path}_{material_suffix}_{timestamp}.json"
-            with open(json_path, 'w', encoding='utf-8') as f:
-                json.dump(metadata, f, indent=2, ensure_ascii=False)
+            self._write_json(metadata, json_path)
             print(f"Saved JSON metadata to: {json_path}")
         
         if "readable" in formats:
@@ -786,57 +1440,46 @@ class ClaudeImage(ClaudeBase):
         Returns:
             None
         """
+        dc = metadata.get('dublin_core', {})
+        rows = list(filter(None, (_dublin_core_row(element, data) for element, data in dc.items())))
+
+        specialized = metadata.get('specialized_elements', {})
+        rows += [
+            (
+                'specialized',
+                element,
+                str(data['value']),
+                data.get('confidence', ''),
+                '',
+                data.get('reasoning', ''),
+                data.get('source_metadata', '')
+            )
+            for element, data in specialized.items()
+            if isinstance(data, dict) and data.get('value')
+        ]
+
+        additional = metadata.get('additional_elements', {})
+        rows += [
+            (
+                'additional',
+                element,
+                str(data['value']),
+                data.get('confidence', ''),
+                '',
+                data.get('reasoning', ''),
+                ''
+            )
+            for element, data in additional.items()
+            if isinstance(data, dict) and data.get('value')
+        ]
+
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(['Section', 'Element', 'Value', 'Confidence', 'Authority', 'Reasoning', 'Source_Metadata'])
+        writer.writerows(rows)
+
         with open(filepath, 'w', newline='', encoding='utf-8') as csvfile:
-            writer = csv.writer(csvfile)
-            writer.writerow(['Section', 'Element', 'Value', 'Confidence', 'Authority', 'Reasoning', 'Source_Metadata'])
-            
-            # Dublin Core elements
-            dc = metadata.get('dublin_core', {})
-            for element, data in dc.items():
-                if isinstance(data, dict) and data.get('value'):
-                    value = data['value']
-                    if isinstance(value, list):
-                        value = '; '.join(str(v) for v in value)
-                    
-                    authority = data.get('authority', '')
-                    if isinstance(authority, list):
-                        authority = '; '.join(authority)
-                    
-                    writer.writerow([
-                        'dublin_core',
-                        element,
-                        str(value),
-                        data.get('confidence', ''),
-                        authority,
-                        data.get('reasoning', ''),
-                        data.get('source_metadata', '')
-                    ])
-            
-            specialized = metadata.get('specialized_elements', {})
-            for element, data in specialized.items():
-                if isinstance(data, dict) and data.get('value'):
-                    writer.writerow([
-                        'specialized',
-                        element,
-                        str(data['value']),
-                        data.get('confidence', ''),
-                        '',
-                        data.get('reasoning', ''),
-                        data.get('source_metadata', '')
-                    ])
-            
-            additional = metadata.get('additional_elements', {})
-            for element, data in additional.items():
-                if isinstance(data, dict) and data.get('value'):
-                    writer.writerow([
-                        'additional',
-                        element,
-                        str(data['value']),
-                        data.get('confidence', ''),
-                        '',
-                        data.get('reasoning', ''),
-                        ''
-                    ])
+            csvfile.write(buffer.getvalue())
 
     def analyze_image_only(self, image_path: str, descriptive_prompt: str = None, model: str = None) -> Tuple[str, Dict]:
         """Analyzes an image without existing metadata to extract basic information
@@ -876,7 +1519,8 @@ Focus on what can be directly observed in the image."""
         try:
             image_data, media_type = self.encode_image(image_path)
             
-            response = self.client.messages.create(
+            response_text = self._create_message(
+                make_key(image_data, descriptive_prompt, model),
                 model=model,
                 max_tokens=2000,
                 messages=[
@@ -899,12 +1543,6 @@ Focus on what can be directly observed in the image."""
                     }
                 ]
             )
-            
-            # Store the Cost
-            self._store_response_data(response, model)
-
-            response_text = response.content[0].text.strip()
-
 
             # Parse response using unified parser (handles TOON format)
             try:
@@ -918,16 +1556,23 @@ Focus on what can be directly observed in the image."""
             print(f"Error analyzing image {image_path}: {str(e)}")
             return "", {"error": str(e)}
 
-    def batch_analyze_metadata(self, metadata_list: List[Dict], output_dir: str = "batch_analysis"):
+    def batch_analyze_metadata(self, metadata_list: List[Dict], output_dir: str = "batch_analysis",
+                               max_concurrency: Optional[int] = None):
         """Analyze multiple metadata records in batch
-        
+
+        Records are sent to Claude concurrently, with at most max_concurrency
+        requests in flight at once. Each result is appended to
+        batch_summary.ndjson as soon as it finishes.
+
         Args:
             metadata_list (list): List of dicts with 'metadata' and optional 'material_type' keys
             output_dir (str): Directory to save batch results
-            
+            max_concurrency (Optional[int]): Requests in flight at once
+                (defaults to config.http_config.max_concurrent_requests)
+
         Returns:
             list: List of analysis results
-            
+
         Example:
             >>> img = ClaudeImage()
             >>> metadata_batch = [
@@ -936,38 +1581,151 @@ Focus on what can be directly observed in the image."""
             ... ]
             >>> results = img.batch_analyze_metadata(metadata_batch)
         """
-        import os
         os.makedirs(output_dir, exist_ok=True)
-        
-        results = []
+
+        summary_path = os.path.join(output_dir, "batch_summary.ndjson")
+        results = asyncio.run(self._batch_analyze_metadata_async(
+            metadata_list, output_dir, max_concurrency or http_config.max_concurrent_requests, summary_path
+        ))
+        print(f"Batch analysis complete. Summary saved to: {summary_path}")
+
+        return results
+
+    async def _batch_analyze_metadata_async(self, metadata_list: List[Dict], output_dir: str,
+                                            max_concurrency: int, summary_path: str) -> List[Dict]:
+        """Analyze metadata records concurrently, bounded by a semaphore
+
+        Records with the same material type and metadata are only sent once.
+
+        Args:
+            metadata_list (list): List of dicts with 'metadata' and optional 'material_type' keys
+            output_dir (str): Directory to save individual results
+            max_concurrency (int): Requests in flight at once
+            summary_path (str): NDJSON file to append each result to
+
+        Returns:
+            list: Analysis results in the same order as metadata_list
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        # Identical records are sent once and the analysis shared by each copy
+        groups = defaultdict(list)
         for i, item in enumerate(metadata_list):
-            print(f"Processing item {i+1}/{len(metadata_list)}...")
-            
-            self.set_metadata(item['metadata'])
-            if 'material_type' in item:
-                self.material_type = item['material_type'].upper()
-                self.prompt = self._format_prompt()
-            
-            response, analysis = self.get_dublin_core_analysis()
-            
-            if 'error' not in analysis:
-                output_path = os.path.join(output_dir, f"item_{i+1:03d}")
-                self.save_analysis(analysis, output_path, formats=["json"])
-            
-            results.append({
-                'item_number': i+1,
-                'material_type': self.material_type,
-                'response': response,
-                'analysis': analysis
-            })
-        
-        summary_path = os.path.join(output_dir, "batch_summary.json")
-        with open(summary_path, 'w', encoding='utf-8') as f:
-            json.dump(results, f, indent=2, ensure_ascii=False)
+            groups[(item.get('material_type', self.material_type).upper(), item.get('metadata'))].append(i)
+
+        async def analyze(indices: List[int], client: anthropic.AsyncAnthropic, summary) -> List[Dict]:
+            item = metadata_list[indices[0]]
+            material_type = item.get('material_type', self.material_type).upper()
+            async with semaphore:
+                print(f"Processing item {indices[0]+1}/{len(metadata_list)}...")
+                response, analysis = await self._get_dublin_core_analysis_async(
+                    client, item['metadata'], material_type
+                )
+
+            return [
+                self._record_batch_result(i, material_type, response, analysis, output_dir, summary)
+                for i in indices
+            ]
+
+        results = [None] * len(metadata_list)
+        with open(summary_path, 'wb') as summary:
+            async with self.get_async_client() as client:
+                outcomes = await asyncio.gather(
+                    *(analyze(indices, client, summary) for indices in groups.values()),
+                    return_exceptions=True
+                )
+
+            for (material_type, _), indices, outcome in zip(groups, groups.values(), outcomes):
+                if isinstance(outcome, Exception):
+                    outcome = [
+                        self._record_batch_result(i, material_type, "", {"error": str(outcome)}, output_dir, summary)
+                        for i in indices
+                    ]
+                for i, result in zip(indices, outcome):
+                    results[i] = result
+
+        return results
+
+    def batch_analyze_metadata_with_batches_api(self, metadata_list: List[Dict],
+                                                output_dir: str = "batch_analysis", model: str = None):
+        """Analyze multiple metadata records through the Message Batches API
+
+        Costs half as much as batch_analyze_metadata but blocks until the
+        batch finishes, which can take up to 24 hours. Results are written
+        the same way, to individual JSON files and batch_summary.ndjson.
+
+        Args:
+            metadata_list (list): List of dicts with 'metadata' and optional 'material_type' keys
+            output_dir (str): Directory to save batch results
+            model (str): The Claude Model to Use (defaults to self.model)
+
+        Returns:
+            list: List of analysis results
+
+        Example:
+            >>> img = ClaudeImage()
+            >>> results = img.batch_analyze_metadata_with_batches_api(metadata_batch)
+        """
+        if model is None:
+            model = self.model
+        os.makedirs(output_dir, exist_ok=True)
+
+        material_types = [item.get('material_type', self.material_type).upper() for item in metadata_list]
+        requests = {}
+        for i, (item, material_type) in enumerate(zip(metadata_list, material_types)):
+            existing_metadata = item.get('metadata', "")
+            if existing_metadata.strip():
+                prompt = self._format_prompt(existing_metadata, material_type)
+                requests[i] = (make_key(prompt, model), {
+                    "model": model,
+                    "max_tokens": 3000,
+                    "messages": [{"role": "user", "content": self._build_content(prompt)}]
+                })
+
+        responses = dict(zip(requests, self._create_message_batch(list(requests.values()))))
+
+        summary_path = os.path.join(output_dir, "batch_summary.ndjson")
+        results = []
+        with open(summary_path, 'wb') as summary:
+            for i, material_type in enumerate(material_types):
+                response = responses.get(i, "")
+                if i not in requests:
+                    analysis = {"error": "No existing metadata provided for analysis"}
+                elif isinstance(response, Exception):
+                    response, analysis = "", {"error": str(response)}
+                else:
+                    analysis = self._parse_metadata(response)
+                results.append(self._record_batch_result(i, material_type, response, analysis, output_dir, summary))
         print(f"Batch analysis complete. Summary saved to: {summary_path}")
-        
+
         return results
 
+    def _record_batch_result(self, i: int, material_type: str, response: str, analysis: Dict,
+                             output_dir: str, summary) -> Dict:
+        """Save one batch result and append it to the batch summary
+
+        Args:
+            i (int): Index of the record in the batch
+            material_type (str): Material type of the record
+            response (str): The response from Claude
+            analysis (dict): The parsed metadata analysis
+            output_dir (str): Directory to save the individual result
+            summary: NDJSON summary file opened in binary mode
+
+        Returns:
+            dict: The summary record
+        """
+        if 'error' not in analysis:
+            output_path = os.path.join(output_dir, f"item_{i+1:03d}")
+            self.save_analysis(analysis, output_path, formats=["json"], material_type=material_type)
+
+        return self._append_summary(summary, {
+            'item_number': i+1,
+            'material_type': material_type,
+            'response': response,
+            'analysis': analysis
+        })
+
 
 class ClaudeArticle(ClaudeBase):
     """Class to analyze scholarly article first pages and abstracts for creator and subject metadata
@@ -978,6 +1736,17 @@ class ClaudeArticle(ClaudeBase):
         prompt (str): The formatted Claude prompt with metadata and image location inserted.
     """
 
+    # FAST facets as (key, display name, extra) where extra returns the
+    # facet-specific report lines and CSV additional info
+    _FAST_FACETS = (
+        ('topical_facet', 'Topical', _topical_facet_extra),
+        ('geographic_facet', 'Geographic', _scope_facet_extra('Geographic Scope', 'geographic_scope')),
+        ('chronological_facet', 'Chronological', _scope_facet_extra('Temporal Scope', 'temporal_scope')),
+        ('form_facet', 'Form/Genre', _no_facet_extra),
+        ('personal_facet', 'Personal Names', _no_facet_extra),
+        ('corporate_facet', 'Corporate Names', _no_facet_extra)
+    )
+
     def __init__(self, image_path: str = None, existing_metadata: str = "",
                  api_key: Optional[str] = None, model="claude-3-5-haiku-20241022"):
         """Generates a Claude Article analysis object.
@@ -994,21 +1763,23 @@ class ClaudeArticle(ClaudeBase):
         self.model = model
         self.prompt = self._format_prompt()
 
-    def _format_prompt(self):
+    def _format_prompt(self, existing_metadata: Optional[str] = None):
         """Format the prompt with existing metadata and image location
 
+        Args:
+            existing_metadata (Optional[str]): Metadata to insert (defaults to self.existing_metadata)
+
         Returns:
             str: The formatted prompt ready for Claude
         """
-        # Get the article subject and creator prompt template
-        prompt_template = self.get_prompt("subjects_from_abstract.md")
+        if existing_metadata is None:
+            existing_metadata = self.existing_metadata
 
-        # Replace placeholders with actual data
-        image_location = self.image_path if self.image_path else "Image will be provided"
-        formatted_prompt = prompt_template.replace("[INSERT IMAGE LOCATION]", image_location)
-        formatted_prompt = formatted_prompt.replace("[INSERT EXISTING METADATA]", self.existing_metadata)
+        # The template is read and split around the metadata placeholder once
+        head, tail = _split_template("subjects_from_abstract.md", "[INSERT EXISTING METADATA]")
 
-        return formatted_prompt
+        image_location = self.image_path if self.image_path else "Image will be provided"
+        return head + existing_metadata + tail.replace("[INSERT IMAGE LOCATION]", image_location)
 
     def load_metadata_from_file(self, filepath: str, encoding: str = 'utf-8'):
         """Load existing metadata from a file
@@ -1041,35 +1812,15 @@ class ClaudeArticle(ClaudeBase):
         self.existing_metadata = metadata_text
         self.prompt = self._format_prompt()
 
-    def encode_image(self, image_path: str) -> Tuple[str, str]:
-        """Gets an image and returns a tuple with base64 encoding of the file contents and its media type
-
-        Args:
-            image_path (str): The path to an image
-
-        Returns:
-            tuple: base64 encoded image contents, media type
-        """
-        with open(image_path, "rb") as image_file:
-            image_data = base64.b64encode(image_file.read()).decode('utf-8')
-        suffix = Path(image_path).suffix.lower()
-        media_type_map = {
-            '.jpg': 'image/jpeg',
-            '.jpeg': 'image/jpeg',
-            '.png': 'image/png',
-            '.gif': 'image/gif',
-            '.webp': 'image/webp',
-            '.pdf': 'application/pdf'
-        }
-        media_type = media_type_map.get(suffix, 'image/jpeg')
-        return image_data, media_type
-
-    def analyze_article(self, image_path: str = None, model: str = None) -> Tuple[str, Dict]:
+    def analyze_article(self, image_path: str = None, model: str = None,
+                        encoded: Optional[Tuple[str, str]] = None) -> Tuple[str, Dict]:
         """Analyzes article first page/abstract to extract creators and FAST subject headings
 
         Args:
             image_path (str): Path to article image (uses self.image_path if not provided)
             model (str): The Claude Model to Use (defaults to self.model)
+            encoded (Optional[Tuple[str, str]]): A (base64 data, media type) pair from
+                encode_image, to skip reading and encoding the image again
 
         Returns:
             tuple: str (the response from Claude), dict (the creator and subject analysis)
@@ -1088,49 +1839,91 @@ class ClaudeArticle(ClaudeBase):
             return "", {"error": "No image path provided for analysis"}
 
         try:
-            image_data, media_type = self.encode_image(image_path)
+            image_data, media_type = encoded or self.encode_image(image_path)
 
-            response = self.client.messages.create(
+            response_text = self._create_message(
+                make_key(image_data, self.prompt, model),
+                (make_key(image_data, model), self.existing_metadata),
                 model=model,
                 max_tokens=3000,
-                messages=[
-                    {
-                        "role": "user",
-                        "content": [
-                            {
-                                "type": "image",
-                                "source": {
-                                    "type": "base64",
-                                    "media_type": media_type,
-                                    "data": image_data
-                                }
-                            },
-                            {
-                                "type": "text",
-                                "text": self.prompt
-                            }
-                        ]
-                    }
-                ]
+                messages=self._build_messages(image_data, media_type, self.prompt)
             )
 
-            # Store the Cost
-            self._store_response_data(response, model)
+            # Parse response using unified parser (handles TOON format)
+            return response_text, self._parse_metadata(response_text)
 
-            response_text = response.content[0].text.strip()
+        except Exception as e:
+            print(f"Error analyzing article {image_path}: {str(e)}")
+            return "", {"error": str(e)}
 
-            # Parse response using unified parser (handles TOON format)
-            try:
-                metadata = self.parse_response(response_text, format_hint="toon")
-                return response_text, metadata
-            except Exception as e:
-                print(f"Parse error in metadata: {e}")
-                return response_text, {"error": f"Could not parse response: {e}"}
+    async def _analyze_article_async(self, client: anthropic.AsyncAnthropic, image_path: str,
+                                     prompt: str, existing_metadata: str = "", model: str = None,
+                                     encoding: Optional[asyncio.Future] = None,
+                                     embedding=None) -> Tuple[str, Dict]:
+        """Async variant of analyze_article for concurrent batches
+
+        The blocking image read and encode runs in a worker thread so it does
+        not stall other requests on the event loop.
+
+        Args:
+            client (anthropic.AsyncAnthropic): The async client to send the request with
+            image_path (str): Path to article image
+            prompt (str): The formatted prompt for this article
+            existing_metadata (str): The metadata in the prompt, used for near-duplicate cache hits
+            model (str): The Claude Model to Use (defaults to self.model)
+            encoding (Optional[asyncio.Future]): A pending encode_image result started
+                ahead of the request (encoded here in a worker thread if not given)
+            embedding: Precomputed semantic cache embedding of existing_metadata
+
+        Returns:
+            tuple: str (the response from Claude), dict (the creator and subject analysis)
+        """
+        if model is None:
+            model = self.model
+
+        if not image_path:
+            return "", {"error": "No image path provided for analysis"}
+
+        try:
+            if encoding is None:
+                encoding = asyncio.to_thread(self.encode_image, image_path)
+            image_data, media_type = await encoding
+
+            response_text = await self._create_message_async(
+                client,
+                make_key(image_data, prompt, model),
+                (make_key(image_data, model), existing_metadata, embedding),
+                model=model,
+                max_tokens=3000,
+                messages=self._build_messages(image_data, media_type, prompt)
+            )
+            return response_text, self._parse_metadata(response_text)
 
         except Exception as e:
             print(f"Error analyzing article {image_path}: {str(e)}")
             return "", {"error": str(e)}
 
+    def _build_messages(self, image_data: str, media_type: str, prompt: str) -> List[Dict]:
+        """Build the messages for an article analysis request
+
+        Args:
+            image_data (str): Base64 encoded article image
+            media_type (str): Media type of the image
+            prompt (str): The formatted prompt
+
+        Returns:
+            list: Messages for client.messages.create
+        """
+        image_block = {
+            "type": "image",
+            "source": {
+                "type": "base64",
+                "media_type": media_type,
+                "data": image_data
+            }
+        }
+        return [{"role": "user", "content": self._build_content(prompt, image_block)}]
+
     def format_metadata_readable(self, metadata: Dict) -> str:
         """Format creator and subject analysis as human-readable report
 
@@ -1208,45 +2001,16 @@ class ClaudeArticle(ClaudeBase):
             output.append("FAST FACET ANALYSIS:")
             output.append(f"{'=' * 40}")
 
-            facets = [
-                ('topical_facet', 'Topical'),
-                ('geographic_facet', 'Geographic'),
-                ('chronological_facet', 'Chronological'),
-                ('form_facet', 'Form/Genre'),
-                ('personal_facet', 'Personal Names'),
-                ('corporate_facet', 'Corporate Names')
-            ]
-
-            for facet_key, facet_name in facets:
+            for facet_key, facet_name, extra in self._FAST_FACETS:
                 facet_data = fast_analysis.get(facet_key, {})
                 if facet_data and facet_data.get('terms'):
                     output.append(f"\n{facet_name}:")
                     output.append(f"  Terms: {'; '.join(facet_data['terms'])}")
                     output.append(f"  Confidence: {facet_data.get('confidence', 'unknown')}")
-
-                    # Special handling for specific facets
-                    if facet_key == 'topical_facet':
-                        if facet_data.get('primary_concepts'):
-                            output.append(f"  Primary Concepts: {'; '.join(facet_data['primary_concepts'])}")
-                        if facet_data.get('secondary_concepts'):
-                            output.append(f"  Secondary Concepts: {'; '.join(facet_data['secondary_concepts'])}")
-                    elif facet_key == 'geographic_facet' and facet_data.get('geographic_scope'):
-                        output.append(f"  Geographic Scope: {facet_data['geographic_scope']}")
-                    elif facet_key == 'chronological_facet' and facet_data.get('temporal_scope'):
-                        output.append(f"  Temporal Scope: {facet_data['temporal_scope']}")
+                    output.extend(extra(facet_data)[0])
 
         # Flags and warnings
-        flags = metadata.get('flags', {})
-        if any(flags.values()):
-            output.append(f"\n{'=' * 40}")
-            output.append("REVIEW REQUIRED:")
-            output.append(f"{'=' * 40}")
-
-            for flag_type, items in flags.items():
-                if items:
-                    output.append(f"\n{flag_type.replace('_', ' ').title()}:")
-                    for item in items:
-                        output.append(f"  • {item}")
+        output.extend(self._format_flags(metadata))
 
         return "\n".join(output)
 
@@ -1270,8 +2034,7 @@ class ClaudeArticle(ClaudeBase):
 
         if "json" in formats:
             json_path = f"{output_path}_{timestamp}.json"
-            with open(json_path, 'w', encoding='utf-8') as f:
-                json.dump(metadata, f, indent=2, ensure_ascii=False)
+            self._write_json(metadata, json_path)
             print(f"Saved JSON metadata to: {json_path}")
 
         if "readable" in formats:
@@ -1296,84 +2059,79 @@ class ClaudeArticle(ClaudeBase):
         Returns:
             None
         """
-        with open(filepath, 'w', newline='', encoding='utf-8') as csvfile:
-            writer = csv.writer(csvfile)
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
 
-            # Creators section
-            writer.writerow(['CREATORS'])
-            writer.writerow(['Name', 'Format', 'Confidence', 'Reasoning'])
+        # Creators section
+        writer.writerow(['CREATORS'])
+        writer.writerow(['Name', 'Format', 'Confidence', 'Reasoning'])
 
-            creator_data = metadata.get('creator', {})
-            personal_creators = creator_data.get('personal_creators', [])
-            for creator in personal_creators:
-                writer.writerow([
-                    creator.get('name', ''),
-                    creator.get('name_format', ''),
-                    creator.get('confidence', ''),
-                    creator.get('reasoning', '')
-                ])
+        creator_data = metadata.get('creator', {})
+        personal_creators = creator_data.get('personal_creators', [])
+        writer.writerows(
+            (
+                creator.get('name', ''),
+                creator.get('name_format', ''),
+                creator.get('confidence', ''),
+                creator.get('reasoning', '')
+            )
+            for creator in personal_creators
+        )
 
-            writer.writerow([])  # Blank row
+        writer.writerow([])  # Blank row
 
-            # FAST Subject Headings section
-            writer.writerow(['FAST SUBJECT HEADINGS'])
-            writer.writerow(['Term', 'Facet', 'FAST ID', 'Confidence', 'Reasoning', 'Source in Text'])
+        # FAST Subject Headings section
+        writer.writerow(['FAST SUBJECT HEADINGS'])
+        writer.writerow(['Term', 'Facet', 'FAST ID', 'Confidence', 'Reasoning', 'Source in Text'])
 
-            subject_data = metadata.get('subject', {})
-            fast_headings = subject_data.get('fast_headings', [])
-            for heading in fast_headings:
-                writer.writerow([
-                    heading.get('term', ''),
-                    heading.get('facet', ''),
-                    heading.get('fast_id', ''),
-                    heading.get('confidence', ''),
-                    heading.get('reasoning', ''),
-                    heading.get('source_in_text', '')
-                ])
-
-            writer.writerow([])  # Blank row
-
-            # FAST Facet Analysis section
-            writer.writerow(['FAST FACET ANALYSIS'])
-            writer.writerow(['Facet', 'Terms', 'Confidence', 'Additional Info'])
-
-            fast_analysis = metadata.get('fast_analysis', {})
-            facets = [
-                ('topical_facet', 'Topical'),
-                ('geographic_facet', 'Geographic'),
-                ('chronological_facet', 'Chronological'),
-                ('form_facet', 'Form/Genre'),
-                ('personal_facet', 'Personal Names'),
-                ('corporate_facet', 'Corporate Names')
-            ]
+        subject_data = metadata.get('subject', {})
+        fast_headings = subject_data.get('fast_headings', [])
+        writer.writerows(
+            (
+                heading.get('term', ''),
+                heading.get('facet', ''),
+                heading.get('fast_id', ''),
+                heading.get('confidence', ''),
+                heading.get('reasoning', ''),
+                heading.get('source_in_text', '')
+            )
+            for heading in fast_headings
+        )
 
-            for facet_key, facet_name in facets:
-                facet_data = fast_analysis.get(facet_key, {})
-                if facet_data and facet_data.get('terms'):
-                    terms = '; '.join(facet_data['terms'])
-                    additional = ''
-                    if facet_key == 'topical_facet':
-                        primary = facet_data.get('primary_concepts', [])
-                        if primary:
-                            additional = f"Primary: {'; '.join(primary)}"
-                    elif facet_key == 'geographic_facet':
-                        additional = facet_data.get('geographic_scope', '')
-                    elif facet_key == 'chronological_facet':
-                        additional = facet_data.get('temporal_scope', '')
-
-                    writer.writerow([
-                        facet_name,
-                        terms,
-                        facet_data.get('confidence', ''),
-                        additional
-                    ])
-
-    def batch_analyze_articles(self, article_list: List[Dict], output_dir: str = "batch_analysis"):
+        writer.writerow([])  # Blank row
+
+        # FAST Facet Analysis section
+        writer.writerow(['FAST FACET ANALYSIS'])
+        writer.writerow(['Facet', 'Terms', 'Confidence', 'Additional Info'])
+
+        fast_analysis = metadata.get('fast_analysis', {})
+        writer.writerows(
+            (
+                facet_name,
+                '; '.join(facet_data['terms']),
+                facet_data.get('confidence', ''),
+                extra(facet_data)[1]
+            )
+            for facet_key, facet_name, extra in self._FAST_FACETS
+            if (facet_data := fast_analysis.get(facet_key, {})) and facet_data.get('terms')
+        )
+
+        with open(filepath, 'w', newline='', encoding='utf-8') as csvfile:
+            csvfile.write(buffer.getvalue())
+
+    def batch_analyze_articles(self, article_list: List[Dict], output_dir: str = "batch_analysis",
+                               max_concurrency: Optional[int] = None):
         """Analyze multiple articles in batch
 
+        Articles are sent to Claude concurrently, with at most max_concurrency
+        requests in flight at once. Each result is appended to
+        batch_summary.ndjson as soon as it finishes.
+
         Args:
             article_list (list): List of dicts with 'image_path' and optional 'existing_metadata' keys
             output_dir (str): Directory to save batch results
+            max_concurrency (Optional[int]): Requests in flight at once
+                (defaults to config.http_config.max_concurrent_requests)
 
         Returns:
             list: List of analysis results
@@ -1386,40 +2144,218 @@ class ClaudeArticle(ClaudeBase):
             ... ]
             >>> results = article.batch_analyze_articles(articles)
         """
-        import os
         os.makedirs(output_dir, exist_ok=True)
 
+        summary_path = os.path.join(output_dir, "batch_summary.ndjson")
+        results = asyncio.run(self._batch_analyze_articles_async(
+            article_list, output_dir, max_concurrency or http_config.max_concurrent_requests, summary_path
+        ))
+        print(f"Batch analysis complete. Summary saved to: {summary_path}")
+
+        return results
+
+    async def _batch_analyze_articles_async(self, article_list: List[Dict], output_dir: str,
+                                            max_concurrency: int, summary_path: str) -> List[Dict]:
+        """Analyze articles concurrently, bounded by a semaphore
+
+        Every image is read and encoded up front in a thread pool, so disk
+        reads and base64 encoding overlap with requests already in flight
+        rather than running one at a time as each request starts. Articles
+        that share an image file's bytes and metadata are only sent once.
+
+        Args:
+            article_list (list): List of dicts with 'image_path' and optional 'existing_metadata' keys
+            output_dir (str): Directory to save individual results
+            max_concurrency (int): Requests in flight at once
+            summary_path (str): NDJSON file to append each result to
+
+        Returns:
+            list: Analysis results in the same order as article_list
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        loop = asyncio.get_running_loop()
+
+        # Pull out the fields once so each pass below works over a flat list
+        paths = [item.get('image_path') for item in article_list]
+        metadatas = [item.get('existing_metadata', self.existing_metadata) for item in article_list]
+
+        async def analyze(indices: List[int], client: anthropic.AsyncAnthropic, summary,
+                          encoding: Optional[asyncio.Future], embedding) -> List[Dict]:
+            first = indices[0]
+            prompt = self._format_prompt(metadatas[first])
+            async with semaphore:
+                print(f"Processing article {first + 1}/{len(article_list)}...")
+                response, analysis = await self._analyze_article_async(
+                    client, files[first], prompt, metadatas[first],
+                    encoding=encoding, embedding=embedding
+                )
+
+            return [
+                self._record_batch_result(i, paths[i], response, analysis, output_dir, summary)
+                for i in indices
+            ]
+
+        results = [None] * len(article_list)
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor, \
+                open(summary_path, 'wb') as summary:
+            # Articles whose image is missing are reported without further work
+            files = _find_files(paths)
+            for i in range(len(article_list)):
+                if files[i] is None:
+                    error = _missing_image_error(paths[i])
+                    print(f"Skipping article {i + 1}: {error}")
+                    results[i] = self._record_batch_result(
+                        i, paths[i], "", {"error": error}, output_dir, summary
+                    )
+            found = [i for i in range(len(article_list)) if files[i] is not None]
+
+            # Articles with the same image bytes and metadata are sent once
+            # and the analysis shared by each copy
+            digests = await asyncio.gather(*(
+                loop.run_in_executor(executor, _file_digest, files[i]) for i in found
+            ))
+            groups = defaultdict(list)
+            for i, digest in zip(found, digests):
+                groups[(digest, metadatas[i]) if digest else i].append(i)
+            firsts = [indices[0] for indices in groups.values()]
+
+            encodings = [loop.run_in_executor(executor, self.encode_image, files[first]) for first in firsts]
+
+            # Embed every article's metadata in one call for the semantic cache
+            semantic_cache = self._semantic_cache()
+            embeddings = [None] * len(firsts)
+            if semantic_cache is not None:
+                embedded = await loop.run_in_executor(
+                    executor, semantic_cache.embed, [metadatas[first] for first in firsts]
+                )
+                embeddings = [embedded[n:n + 1] for n in range(len(firsts))]
+
+            async with self.get_async_client() as client:
+                outcomes = await asyncio.gather(
+                    *(analyze(indices, client, summary, encoding, embedding)
+                      for indices, encoding, embedding in zip(groups.values(), encodings, embeddings)),
+                    return_exceptions=True
+                )
+
+            for indices, outcome in zip(groups.values(), outcomes):
+                if isinstance(outcome, Exception):
+                    outcome = [
+                        self._record_batch_result(i, paths[i], "", {"error": str(outcome)}, output_dir, summary)
+                        for i in indices
+                    ]
+                for i, result in zip(indices, outcome):
+                    results[i] = result
+
+        return results
+
+    def batch_analyze_articles_with_batches_api(self, article_list: List[Dict],
+                                                output_dir: str = "batch_analysis", model: str = None):
+        """Analyze multiple articles through the Message Batches API
+
+        Costs half as much as batch_analyze_articles but blocks until the
+        batch finishes, which can take up to 24 hours. Results are written
+        the same way, to individual JSON files and batch_summary.ndjson.
+
+        Args:
+            article_list (list): List of dicts with 'image_path' and optional 'existing_metadata' keys
+            output_dir (str): Directory to save batch results
+            model (str): The Claude Model to Use (defaults to self.model)
+
+        Returns:
+            list: List of analysis results
+
+        Example:
+            >>> article = ClaudeArticle()
+            >>> results = article.batch_analyze_articles_with_batches_api(articles)
+        """
+        if model is None:
+            model = self.model
+        os.makedirs(output_dir, exist_ok=True)
+
+        # Pull out the fields once so each pass below works over a flat list
+        paths = [item.get('image_path') for item in article_list]
+        metadatas = [item.get('existing_metadata', self.existing_metadata) for item in article_list]
+        files = _find_files(paths)
+
+        def encode(i: int):
+            if files[i] is None:
+                error = _missing_image_error(paths[i])
+                print(f"Skipping article {i + 1}: {error}")
+                return FileNotFoundError(error)
+            try:
+                return self.encode_image(files[i])
+            except Exception as e:
+                print(f"Error analyzing article {paths[i]}: {str(e)}")
+                return e
+
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+            encodings = list(executor.map(encode, range(len(paths))))
+
+        requests = {}
+        for i, (encoded, metadata) in enumerate(zip(encodings, metadatas)):
+            if not isinstance(encoded, Exception):
+                image_data, media_type = encoded
+                prompt = self._format_prompt(metadata)
+                requests[i] = (make_key(image_data, prompt, model), {
+                    "model": model,
+                    "max_tokens": 3000,
+                    "messages": self._build_messages(image_data, media_type, prompt)
+                })
+
+        # Embed every article's metadata in one call for the semantic cache
+        semantic = None
+        semantic_cache = self._semantic_cache()
+        if semantic_cache is not None and requests:
+            embedded = semantic_cache.embed([metadatas[i] for i in requests])
+            semantic = [
+                (make_key(encodings[i][0], model), metadatas[i], embedded[n:n + 1])
+                for n, i in enumerate(requests)
+            ]
+
+        responses = dict(zip(requests, self._create_message_batch(list(requests.values()), semantic)))
+
+        summary_path = os.path.join(output_dir, "batch_summary.ndjson")
         results = []
-        for i, item in enumerate(article_list):
-            print(f"Processing article {i + 1}/{len(article_list)}...")
-
-            # Set metadata if provided
-            if 'existing_metadata' in item:
-                self.set_metadata(item['existing_metadata'])
-
-            # Analyze
-            response, analysis = self.analyze_article(item['image_path'])
-
-            # Save individual result
-            if 'error' not in analysis:
-                output_path = os.path.join(output_dir, f"article_{i + 1:03d}")
-                self.save_analysis(analysis, output_path, formats=["json"])
-
-            results.append({
-                'article_number': i + 1,
-                'image_path': item['image_path'],
-                'response': response,
-                'analysis': analysis
-            })
-
-        # Save batch summary
-        summary_path = os.path.join(output_dir, "batch_summary.json")
-        with open(summary_path, 'w', encoding='utf-8') as f:
-            json.dump(results, f, indent=2, ensure_ascii=False)
+        with open(summary_path, 'wb') as summary:
+            for i in range(len(article_list)):
+                response = responses.get(i, "")
+                if i not in requests:
+                    analysis = {"error": str(encodings[i])}
+                elif isinstance(response, Exception):
+                    response, analysis = "", {"error": str(response)}
+                else:
+                    analysis = self._parse_metadata(response)
+                results.append(self._record_batch_result(i, paths[i], response, analysis, output_dir, summary))
         print(f"Batch analysis complete. Summary saved to: {summary_path}")
 
         return results
 
+    def _record_batch_result(self, i: int, image_path: Optional[str], response: str, analysis: Dict,
+                             output_dir: str, summary) -> Dict:
+        """Save one batch result and append it to the batch summary
+
+        Args:
+            i (int): Index of the article in the batch
+            image_path (Optional[str]): Path to the article image
+            response (str): The response from Claude
+            analysis (dict): The parsed creator and subject analysis
+            output_dir (str): Directory to save the individual result
+            summary: NDJSON summary file opened in binary mode
+
+        Returns:
+            dict: The summary record
+        """
+        if 'error' not in analysis:
+            output_path = os.path.join(output_dir, f"article_{i + 1:03d}")
+            self.save_analysis(analysis, output_path, formats=["json"])
+
+        return self._append_summary(summary, {
+            'article_number': i + 1,
+            'image_path': image_path,
+            'response': response,
+            'analysis': analysis
+        })
+
     def extract_fast_headings_only(self, metadata: Dict) -> List[str]:
         """Extract just the FAST heading terms as a simple list
 
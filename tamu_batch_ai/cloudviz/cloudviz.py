@@ -1,55 +1,328 @@
+from google.api_core.exceptions import ResourceExhausted, ServiceUnavailable
+from google.api_core.retry_async import AsyncRetry, if_exception_type
 from google.cloud import vision
+import asyncio
+import io
+import mmap
 import os
 import html
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
 from PIL import Image
 
+from ..config import cache_config
+from ..response_cache import get_vision_cache, make_key
+
+
+# Start and end of every hOCR document. The header is split around the
+# creation date, and the part after it only depends on the page size.
+_HOCR_HEADER = '''<?xml version="1.0" encoding="UTF-8"?>
+<!DOCTYPE html PUBLIC "-//W3C//DTD XHTML 1.0 Transitional//EN"
+    "http://www.w3.org/TR/xhtml1/DTD/xhtml1-transitional.dtd">
+<html xmlns="http://www.w3.org/1999/xhtml" xml:lang="en" lang="en">
+<head>
+<meta http-equiv="Content-Type" content="text/html;charset=utf-8" />
+<meta name="ocr-system" content="Google Cloud Vision API" />
+<meta name="ocr-creation-date" content="'''
+_HOCR_FOOTER = "\n</div>\n</body>\n</html>"
+
+
+@lru_cache(maxsize=16)
+def _page_open(width, height):
+    """The rest of the header for a page size; scans from one source share it"""
+    return f'''" />
+<title>hOCR Output</title>
+</head>
+<body>
+<div class="ocr_page" id="page_1" title="bbox 0 0 {width} {height}; ppageno 0">'''
+
+
+def _write_header(write, width, height):
+    """Write the hOCR header for a page"""
+    write(_HOCR_HEADER)
+    write(datetime.now().isoformat())
+    write(_page_open(width, height))
+
+
+def _image_size(image_path):
+    """Read an image's (width, height) without decoding its pixels"""
+    with Image.open(image_path) as img:
+        return img.size
+
+
+def _pb(response):
+    """Get the raw protobuf message behind a Vision response.
+
+    Reading fields through the proto-plus wrappers costs roughly ten times
+    as much as reading them from the underlying message, which adds up over
+    the vertices and symbols of every word on a page.
+    """
+    return vision.AnnotateImageResponse.pb(response)
+
+
+def _bbox4(vertices):
+    """Return (x1, y1, x2, y2) around a bounding polygon's vertices
+
+    Vision boxes are quadrilaterals, so the common case unpacks the four
+    vertices once rather than iterating over them four times.
+    """
+    if len(vertices) == 4:
+        a, b, c, d = vertices
+        xs = (a.x, b.x, c.x, d.x)
+        ys = (a.y, b.y, c.y, d.y)
+    else:
+        xs = [v.x for v in vertices]
+        ys = [v.y for v in vertices]
+    return min(xs), min(ys), max(xs), max(ys)
+
 
 class CloudViz:
+    # Most images the Vision API accepts in one batch_annotate_images request
+    MAX_BATCH_SIZE = 16
+
+    # Responses kept in memory, so several methods called on the same
+    # unchanged file share one API call
+    CACHE_SIZE = 32
+
+    # Part of the on-disk cache key; change it when the request sent for an
+    # image changes so earlier responses are no longer used
+    CACHE_VERSION = "DOCUMENT_TEXT_DETECTION/1"
+
+    # Backoff for requests rejected by quota (429) or temporarily unavailable
+    ASYNC_RETRY = AsyncRetry(
+        predicate=if_exception_type(ResourceExhausted, ServiceUnavailable),
+        initial=1.0, maximum=47.0, multiplier=2.0, timeout=300.0
+    )
+
     def __init__(self):
         self.client = vision.ImageAnnotatorClient.from_service_account_json(
             os.environ.get('GOOGLE_CLOUD_VIZ_CREDENTIALS')
         )
+        self._responses = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk_cache = get_vision_cache() if cache_config.vision_enabled else None
+
+    @staticmethod
+    def _document_request(content):
+        """Build a document text detection request for image bytes"""
+        return vision.AnnotateImageRequest(
+            image=vision.Image(content=content),
+            features=[vision.Feature(type_=vision.Feature.Type.DOCUMENT_TEXT_DETECTION)]
+        )
+
+    def _prepare(self, image_path):
+        """Read an image and look its bytes up in the on-disk cache.
+
+        returns:
+            tuple: (content hash, cached response or None, request or None)
+        """
+        with open(image_path, 'rb') as image_file:
+            if os.fstat(image_file.fileno()).st_size == 0:
+                # Empty files cannot be mapped
+                return self._lookup(b'')
+            # Hash straight from the page cache; the bytes are only copied
+            # when a request has to be built
+            with mmap.mmap(image_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                with memoryview(mapped) as view:
+                    return self._lookup(view)
+
+    def _lookup(self, content):
+        """Check the on-disk cache for image bytes, building a request on a miss"""
+        digest = make_key(content, self.CACHE_VERSION)
+        if self._disk_cache is not None:
+            data = self._disk_cache.get(digest)
+            if data is not None:
+                return digest, vision.AnnotateImageResponse.deserialize(data), None
+        return digest, None, self._document_request(bytes(content))
+
+    def _store(self, digest, response):
+        """Save a response to the on-disk cache, unless the image failed"""
+        if self._disk_cache is not None and not response.error.code:
+            self._disk_cache.set(digest, vision.AnnotateImageResponse.serialize(response))
+
+    @staticmethod
+    def _cache_key(image_path):
+        """Key a response by file path, modification time and size"""
+        stat = os.stat(image_path)
+        return os.path.abspath(image_path), stat.st_mtime_ns, stat.st_size
+
+    def _cached(self, key):
+        """Get a cached response, or None"""
+        with self._lock:
+            response = self._responses.get(key)
+            if response is not None:
+                self._responses.move_to_end(key)
+            return response
+
+    def _remember(self, key, response):
+        """Cache a response, dropping the least recently used beyond CACHE_SIZE"""
+        with self._lock:
+            self._responses[key] = response
+            self._responses.move_to_end(key)
+            while len(self._responses) > self.CACHE_SIZE:
+                self._responses.popitem(last=False)
+
+    def annotate(self, image_path):
+        """Run document text detection on an image.
+
+        Responses are cached in memory and on disk, so calling several
+        extraction methods on the same unchanged file, or running again on
+        the same images, only calls the API once.
+
+        args:
+            image_path (str): path to an image
+
+        returns:
+            vision.AnnotateImageResponse: the Vision API response
+        """
+        return self.annotate_batch([image_path])[0]
+
+    def annotate_batch(self, image_paths):
+        """Run document text detection on several images.
+
+        Uncached images are sent MAX_BATCH_SIZE at a time with
+        batch_annotate_images, one round-trip per request instead of per image.
+
+        args:
+            image_paths (list): paths to images
+
+        returns:
+            list: a vision.AnnotateImageResponse for each path, in order
+        """
+        keys = [self._cache_key(path) for path in image_paths]
+        responses = {}
+        pending = {}
+        for key, path in zip(keys, image_paths):
+            cached = self._cached(key)
+            if cached is not None:
+                responses[key] = cached
+            else:
+                pending.setdefault(key, path)
+
+        pending = list(pending.items())
+        for start in range(0, len(pending), self.MAX_BATCH_SIZE):
+            chunk = []
+            for key, path in pending[start:start + self.MAX_BATCH_SIZE]:
+                digest, cached, request = self._prepare(path)
+                if cached is not None:
+                    self._remember(key, cached)
+                    responses[key] = cached
+                else:
+                    chunk.append((key, digest, request))
+            if not chunk:
+                continue
+            batch = self.client.batch_annotate_images(requests=[request for _, _, request in chunk])
+            for (key, digest, _), response in zip(chunk, batch.responses):
+                self._store(digest, response)
+                self._remember(key, response)
+                responses[key] = response
+
+        return [responses[key] for key in keys]
+
+    async def abatch_annotate(self, image_paths, max_concurrency=8, rps=4):
+        """Run document text detection on many images concurrently.
+
+        At most max_concurrency requests are in flight and new requests start
+        no faster than rps per second, so one slow response does not hold up
+        the rest. Requests rejected for quota are retried with exponential
+        backoff. Responses share the cache used by annotate().
+
+        args:
+            image_paths (list): paths to images
+            max_concurrency (int): requests in flight at once
+            rps (float): most requests started per second
+
+        returns:
+            list: a vision.AnnotateImageResponse for each path, in order
+        """
+        keys = [self._cache_key(path) for path in image_paths]
+        unique = dict(zip(keys, image_paths))
+        semaphore = asyncio.Semaphore(max_concurrency)
+        gate = asyncio.Lock()
+        next_start = time.monotonic()
+
+        async def wait_turn():
+            nonlocal next_start
+            async with gate:
+                now = time.monotonic()
+                delay = next_start - now
+                next_start = max(next_start, now) + 1 / rps
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+        async def annotate(client, key, path):
+            cached = self._cached(key)
+            if cached is not None:
+                return cached
+            async with semaphore:
+                digest, cached, request = await asyncio.to_thread(self._prepare, path)
+                if cached is not None:
+                    self._remember(key, cached)
+                    return cached
+                await wait_turn()
+                batch = await client.batch_annotate_images(requests=[request], retry=self.ASYNC_RETRY)
+            response = batch.responses[0]
+            await asyncio.to_thread(self._store, digest, response)
+            self._remember(key, response)
+            return response
+
+        # Async gRPC clients are bound to the running event loop
+        client = vision.ImageAnnotatorAsyncClient.from_service_account_json(
+            os.environ.get('GOOGLE_CLOUD_VIZ_CREDENTIALS')
+        )
+        async with client:
+            responses = await asyncio.gather(*(annotate(client, key, path) for key, path in unique.items()))
 
-    def extract_text(self, image_path):
+        by_key = dict(zip(unique, responses))
+        return [by_key[key] for key in keys]
+
+    async def abatch_extract(self, image_paths, max_concurrency=8, rps=4):
+        """Extract the text of many images concurrently.
+
+        args:
+            image_paths (list): paths to images
+            max_concurrency (int): requests in flight at once
+            rps (float): most requests started per second
+
+        returns:
+            list: text in each image, in order
+        """
+        responses = await self.abatch_annotate(image_paths, max_concurrency, rps)
+        return [self.extract_text(path, response) for path, response in zip(image_paths, responses)]
+
+    def extract_text(self, image_path, response=None):
         """Extract just the text of an image.
 
         args:
             image_path (str): path to an image
+            response (vision.AnnotateImageResponse): an existing response for the image, from annotate()
 
         returns:
             str: text in the image
         """
-        with open(image_path, 'rb') as image_file:
-            content = image_file.read()
-
-        image = vision.Image(content=content)
-        response = self.client.document_text_detection(image=image)
+        if response is None:
+            response = self.annotate(image_path)
         texts = response.text_annotations
         if texts:
             return texts[0].description
         return ""
 
-    def extract_text_with_boxes(self, image_path):
+    def extract_text_with_boxes(self, image_path, response=None):
         """Extract text with bounding box coordinates"""
-        with open(image_path, 'rb') as image_file:
-            content = image_file.read()
-
-        image = vision.Image(content=content)
-        response = self.client.document_text_detection(image=image)
+        if response is None:
+            response = self.annotate(image_path)
 
         results = []
 
         # Skip the first annotation since it's in the full text
-        for text in response.text_annotations[1:]:
-            vertices = text.bounding_poly.vertices
-            x_coords = [vertex.x for vertex in vertices]
-            y_coords = [vertex.y for vertex in vertices]
-
-            x = min(x_coords)
-            y = min(y_coords)
-            w = max(x_coords) - x
-            h = max(y_coords) - y
+        for text in _pb(response).text_annotations[1:]:
+            x, y, x2, y2 = _bbox4(text.bounding_poly.vertices)
+            w = x2 - x
+            h = y2 - y
 
             results.append({
                 'text': text.description,
@@ -62,29 +335,22 @@ class CloudViz:
 
         return results
 
-    def extract_structured_text(self, image_path):
+    def extract_structured_text(self, image_path, response=None):
         """Extract text with detailed structure (paragraphs, words, symbols)"""
-        with open(image_path, 'rb') as image_file:
-            content = image_file.read()
-        image = vision.Image(content=content)
-        response = self.client.document_text_detection(image=image)
+        if response is None:
+            response = self.annotate(image_path)
         if not response.full_text_annotation:
             return []
         results = []
-        for page in response.full_text_annotation.pages:
+        for page in _pb(response).full_text_annotation.pages:
             for block in page.blocks:
                 for paragraph in block.paragraphs:
                     for word in paragraph.words:
                         word_text = ''.join([symbol.text for symbol in word.symbols])
 
-                        vertices = word.bounding_box.vertices
-                        x_coords = [vertex.x for vertex in vertices]
-                        y_coords = [vertex.y for vertex in vertices]
-
-                        x = min(x_coords)
-                        y = min(y_coords)
-                        w = max(x_coords) - x
-                        h = max(y_coords) - y
+                        x, y, x2, y2 = _bbox4(word.bounding_box.vertices)
+                        w = x2 - x
+                        h = y2 - y
 
                         results.append({
                             'text': word_text,
@@ -96,39 +362,45 @@ class CloudViz:
                         })
         return results
 
-    def to_hocr(self, image_path, image_width=None, image_height=None):
-        """Convert OCR results to hOCR format"""
+    def _hocr_inputs(self, image_path, image_width, image_height, response):
+        """Fill in whichever of the response and image size are missing"""
         if image_width is None or image_height is None:
-            with Image.open(image_path) as img:
-                image_width, image_height = img.size
-
-        with open(image_path, 'rb') as image_file:
-            content = image_file.read()
+            if response is None:
+                # Read the image size in a worker thread while the API call is in flight
+                with ThreadPoolExecutor(max_workers=1) as executor:
+                    size = executor.submit(_image_size, image_path)
+                    response = self.annotate(image_path)
+                    image_width, image_height = size.result()
+            else:
+                image_width, image_height = _image_size(image_path)
+
+        if response is None:
+            response = self.annotate(image_path)
+        return response, image_width, image_height
+
+    def to_hocr(self, image_path, image_width=None, image_height=None, response=None, out=None):
+        """Convert OCR results to hOCR format
+
+        The document is written piece by piece to ``out`` when it is given
+        (save_hocr passes the output file), so large pages never sit in
+        memory as a list of fragments plus the joined string. Without
+        ``out`` the hOCR is returned as a string.
+        """
+        if out is None:
+            buffer = io.StringIO()
+            self.to_hocr(image_path, image_width, image_height, response, out=buffer)
+            return buffer.getvalue()
 
-        image = vision.Image(
-            content=content
-        )
-        response = self.client.document_text_detection(
-            image=image
+        response, image_width, image_height = self._hocr_inputs(
+            image_path, image_width, image_height, response
         )
 
         if not response.full_text_annotation:
-            return self._empty_hocr(image_path, image_width, image_height)
-
-        hocr_lines = [
-            '<?xml version="1.0" encoding="UTF-8"?>',
-            '<!DOCTYPE html PUBLIC "-//W3C//DTD XHTML 1.0 Transitional//EN"',
-            '    "http://www.w3.org/TR/xhtml1/DTD/xhtml1-transitional.dtd">',
-            '<html xmlns="http://www.w3.org/1999/xhtml" xml:lang="en" lang="en">',
-            '<head>',
-            '<meta http-equiv="Content-Type" content="text/html;charset=utf-8" />',
-            '<meta name="ocr-system" content="Google Cloud Vision API" />',
-            f'<meta name="ocr-creation-date" content="{datetime.now().isoformat()}" />',
-            '<title>hOCR Output</title>',
-            '</head>',
-            '<body>',
-            f'<div class="ocr_page" id="page_1" title="bbox 0 0 {image_width} {image_height}; ppageno 0">'
-        ]
+            out.write(self._empty_hocr(image_width, image_height))
+            return None
+
+        write = out.write
+        _write_header(write, image_width, image_height)
 
         page_num = 1
         block_num = 1
@@ -136,135 +408,128 @@ class CloudViz:
         line_num = 1
         word_num = 1
 
-        for page in response.full_text_annotation.pages:
+        for page in _pb(response).full_text_annotation.pages:
             for block in page.blocks:
-                block_vertices = block.bounding_box.vertices
-                block_x1 = min(v.x for v in block_vertices)
-                block_y1 = min(v.y for v in block_vertices)
-                block_x2 = max(v.x for v in block_vertices)
-                block_y2 = max(v.y for v in block_vertices)
+                block_x1, block_y1, block_x2, block_y2 = _bbox4(block.bounding_box.vertices)
 
-                hocr_lines.append(
-                    f'<div class="ocr_carea" id="carea_{page_num}_{block_num}" title="bbox {block_x1} {block_y1} {block_x2} {block_y2}">')
+                write(
+                    f'\n<div class="ocr_carea" id="carea_{page_num}_{block_num}" title="bbox {block_x1} {block_y1} {block_x2} {block_y2}">')
 
                 for paragraph in block.paragraphs:
-                    par_vertices = paragraph.bounding_box.vertices
-                    par_x1 = min(v.x for v in par_vertices)
-                    par_y1 = min(v.y for v in par_vertices)
-                    par_x2 = max(v.x for v in par_vertices)
-                    par_y2 = max(v.y for v in par_vertices)
-
-                    hocr_lines.append(
-                        f'<p class="ocr_par" id="par_{page_num}_{par_num}" title="bbox {par_x1} {par_y1} {par_x2} {par_y2}">')
-
-                    current_line_words = []
+                    par_x1, par_y1, par_x2, par_y2 = _bbox4(paragraph.bounding_box.vertices)
+
+                    write(
+                        f'\n<p class="ocr_par" id="par_{page_num}_{par_num}" title="bbox {par_x1} {par_y1} {par_x2} {par_y2}">')
+
+                    # (word, bbox) pairs; each box is computed once and
+                    # reused for line grouping, the line bbox and the word.
+                    # Sorting by top edge puts words that arrive out of
+                    # reading order on the right line; each line is then
+                    # ordered left to right.
+                    words = sorted(
+                        ((word, _bbox4(word.bounding_box.vertices)) for word in paragraph.words),
+                        key=lambda item: item[1][1]
+                    )
+                    lines = []
                     current_line_y = None
                     line_threshold = 10  # pixels
 
-                    for word in paragraph.words:
-                        word_vertices = word.bounding_box.vertices
-                        word_y = min(v.y for v in word_vertices)
-
-                        if current_line_y is None or abs(word_y - current_line_y) <= line_threshold:
-                            current_line_words.append(word)
-                            if current_line_y is None:
-                                current_line_y = word_y
-                        else:
-                            if current_line_words:
-                                hocr_lines.append(self._format_hocr_line(current_line_words, line_num, word_num))
-                                word_num += len(current_line_words)
-                                line_num += 1
-
-                            current_line_words = [word]
+                    for item in words:
+                        word_y = item[1][1]
+                        if current_line_y is None or word_y - current_line_y > line_threshold:
+                            lines.append([item])
                             current_line_y = word_y
+                        else:
+                            lines[-1].append(item)
 
-                    if current_line_words:
-                        hocr_lines.append(self._format_hocr_line(current_line_words, line_num, word_num))
-                        word_num += len(current_line_words)
+                    for line in lines:
+                        line.sort(key=lambda item: item[1][0])
+                        write('\n')
+                        write(self._format_hocr_line(line, line_num, word_num))
+                        word_num += len(line)
                         line_num += 1
 
-                    hocr_lines.append('</p>')
+                    write('\n</p>')
                     par_num += 1
 
-                hocr_lines.append('</div>')
+                write('\n</div>')
                 block_num += 1
 
-        hocr_lines.extend([
-            '</div>',
-            '</body>',
-            '</html>'
-        ])
-
-        return '\n'.join(hocr_lines)
+        write(_HOCR_FOOTER)
+        return None
 
     def _format_hocr_line(self, words, line_num, start_word_num):
-        """Format a line of words for hOCR"""
-        all_vertices = []
-        for word in words:
-            all_vertices.extend(word.bounding_box.vertices)
-
-        line_x1 = min(v.x for v in all_vertices)
-        line_y1 = min(v.y for v in all_vertices)
-        line_x2 = max(v.x for v in all_vertices)
-        line_y2 = max(v.y for v in all_vertices)
+        """Format a line of (word, bbox) pairs for hOCR"""
+        x1s, y1s, x2s, y2s = zip(*(bbox for _, bbox in words))
+        line_x1 = min(x1s)
+        line_y1 = min(y1s)
+        line_x2 = max(x2s)
+        line_y2 = max(y2s)
 
         line_html = [
             f'<span class="ocr_line" id="line_{line_num}" title="bbox {line_x1} {line_y1} {line_x2} {line_y2}">'
         ]
 
-        word_num = start_word_num
-        for word in words:
+        # Bound once per line; these run for every word on the page
+        escape = html.escape
+        append = line_html.append
+        for word_num, (word, (word_x1, word_y1, word_x2, word_y2)) in enumerate(words, start_word_num):
             word_text = ''.join([symbol.text for symbol in word.symbols])
-            word_vertices = word.bounding_box.vertices
-
-            word_x1 = min(v.x for v in word_vertices)
-            word_y1 = min(v.y for v in word_vertices)
-            word_x2 = max(v.x for v in word_vertices)
-            word_y2 = max(v.y for v in word_vertices)
 
-            confidence = int(word.confidence * 100) if word.confidence else 0
+            confidence = word.confidence
+            confidence = int(confidence * 100) if confidence else 0
 
-            escaped_text = html.escape(word_text)
-            line_html.append(
+            escaped_text = escape(word_text)
+            append(
                 f'<span class="ocrx_word" id="word_{word_num}" title="bbox {word_x1} {word_y1} {word_x2} {word_y2}; x_wconf {confidence}">{escaped_text}</span>')
-            word_num += 1
         line_html.append('</span>')
         return ' '.join(line_html)
 
     def _empty_hocr(self, width, height):
         """Return empty hOCR structure when no text found"""
-
-        return f'''<?xml version="1.0" encoding="UTF-8"?>
-            <!DOCTYPE html PUBLIC "-//W3C//DTD XHTML 1.0 Transitional//EN"
-            "http://www.w3.org/TR/xhtml1/DTD/xhtml1-transitional.dtd">
-            <html xmlns="http://www.w3.org/1999/xhtml" xml:lang="en" lang="en">
-            <head>
-            <meta http-equiv="Content-Type" content="text/html;charset=utf-8" />
-            <meta name="ocr-system" content="Google Cloud Vision API" />
-            <meta name="ocr-creation-date" content="{datetime.now().isoformat()}" />
-            <title>hOCR Output</title>
-            </head>
-            <body>
-            <div class="ocr_page" id="page_1" title="bbox 0 0 {width} {height}; ppageno 0">
-            </div>
-            </body>
-            </html>'''
-
-    def save_hocr(self, image_path, output_path, image_width=None, image_height=None):
-        """Generate and save hOCR to file"""
-        hocr_content = self.to_hocr(image_path, image_width, image_height)
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(hocr_content)
+        buffer = io.StringIO()
+        _write_header(buffer.write, width, height)
+        buffer.write(_HOCR_FOOTER)
+        return buffer.getvalue()
+
+    def save_hocr(self, image_path, output_path, image_width=None, image_height=None, response=None):
+        """Generate and save hOCR to file, writing it out as it is built"""
+        # Call the API before opening the file so a failure leaves nothing behind
+        response, image_width, image_height = self._hocr_inputs(
+            image_path, image_width, image_height, response
+        )
+        with open(output_path, 'w', encoding='utf-8', buffering=1 << 20) as f:
+            self.to_hocr(image_path, image_width, image_height, response, out=f)
         return output_path
 
+    def save_hocr_batch(self, image_paths, output_paths, max_workers=8):
+        """Generate and save hOCR for many images.
+
+        Images are processed in a thread pool, so building and writing one
+        page's hOCR overlaps with API calls still in flight for others.
+
+        args:
+            image_paths (list): paths to images
+            output_paths (list): where to save each image's hOCR
+            max_workers (int): images processed at once
+
+        returns:
+            list: the output paths
+        """
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(self.save_hocr, image_paths, output_paths))
+
 
 if __name__ == '__main__':
     cloud_viz = CloudViz()
+    # Call the API once and reuse the response for every format below
+    response = cloud_viz.annotate('test_files/amctrial_mcinnis_0004.jpg')
+
     # How to get just the text
     print(
         "=== Just Text ==="
     )
-    text = cloud_viz.extract_text('test_files/amctrial_mcinnis_0004.jpg')
+    text = cloud_viz.extract_text('test_files/amctrial_mcinnis_0004.jpg', response)
     print(
         text[:200] + "..." if len(text) > 200 else text
     )
@@ -274,24 +539,24 @@ if __name__ == '__main__':
         "\n=== Text with Bounding Boxes ==="
     )
     text_boxes = cloud_viz.extract_text_with_boxes(
-        'test_files/amctrial_mcinnis_0004.jpg'
+        'test_files/amctrial_mcinnis_0004.jpg', response
     )
     for item in text_boxes[:5]:
         print(f"Text: '{item['text']}' at ({item['x']}, {item['y']}) size: {item['w']}x{item['h']}")
 
     # Method 2: Structured extraction (word by word)
     print("\n=== Structured Text (Word Level) ===")
-    structured_text = cloud_viz.extract_structured_text('test_files/amctrial_mcinnis_0004.jpg')
+    structured_text = cloud_viz.extract_structured_text('test_files/amctrial_mcinnis_0004.jpg', response)
     for item in structured_text[:5]:
         print(
             f"Word: '{item['text']}' at ({item['x']}, {item['y']}) size: {item['w']}x{item['h']} confidence: {item['confidence']:.2f}")
 
     print("\n=== Generate hOCR ===")
     # Method 3: Generate hOCR format
-    hocr_output = cloud_viz.to_hocr('test_files/amctrial_mcinnis_0004.jpg')
+    hocr_output = cloud_viz.to_hocr('test_files/amctrial_mcinnis_0004.jpg', response=response)
     print("hOCR generated successfully!")
     print(f"Preview (first 500 chars):\n{hocr_output[:500]}...")
 
     # Method 3.5: Save to file
-    cloud_viz.save_hocr('test_files/amctrial_mcinnis_0004.jpg', 'output.hocr')
+    cloud_viz.save_hocr('test_files/amctrial_mcinnis_0004.jpg', 'output.hocr', response=response)
     print("\nhOCR saved to output.hocr")
\ No newline at end of file
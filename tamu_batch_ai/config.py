@@ -1,25 +1,31 @@
 """Centralized configuration for TAMU Batch AI."""
 
 from dataclasses import dataclass, field
-from typing import Dict
+from types import MappingProxyType
+from typing import Mapping
 
+# Max tokens for different task types, shared read-only by every ModelConfig
+# that does not pass its own mapping
+DEFAULT_MAX_TOKENS: Mapping[str, int] = MappingProxyType({
+    "htr": 1000,           # Handwritten text recognition
+    "metadata": 2000,      # Metadata generation for works
+    "av": 4000,            # Audio/video metadata
+    "image": 3000,         # Image/map analysis
+    "article": 3000,       # Article analysis
+    "analyze_only": 2000,  # Image analysis without metadata
+})
 
-@dataclass
+
+@dataclass(slots=True)
 class ModelConfig:
     """Configuration for Claude API model settings."""
 
     # Default model to use
     default_model: str = "claude-3-5-haiku-20241022"
 
-    # Max tokens for different task types
-    max_tokens: Dict[str, int] = field(default_factory=lambda: {
-        "htr": 1000,           # Handwritten text recognition
-        "metadata": 2000,      # Metadata generation for works
-        "av": 4000,            # Audio/video metadata
-        "image": 3000,         # Image/map analysis
-        "article": 3000,       # Article analysis
-        "analyze_only": 2000,  # Image analysis without metadata
-    })
+    # Max tokens for different task types; the factory returns the shared
+    # mapping rather than building a new dict per instance
+    max_tokens: Mapping[str, int] = field(default_factory=lambda: DEFAULT_MAX_TOKENS)
 
     # Temperature setting (0-1, lower = more deterministic)
     temperature: float = 0.0
@@ -29,7 +35,7 @@ class ModelConfig:
         return self.max_tokens.get(task_type, 2000)
 
 
-@dataclass
+@dataclass(slots=True)
 class PathConfig:
     """Configuration for file paths and directories."""
 
@@ -43,6 +49,102 @@ class PathConfig:
     json_ext: str = ".json"
 
 
+@dataclass
+class ImageConfig:
+    """Configuration for images sent to Claude's vision API."""
+
+    # Downscale and re-encode images before base64 encoding
+    optimize_images: bool = True
+
+    # Longest edge and total pixels; Claude gains nothing from larger images
+    max_long_edge: int = 1568
+    max_pixels: int = 1_300_000
+
+    # JPEG quality used when re-encoding downscaled images
+    jpeg_quality: int = 85
+
+    # Keep downscaled images on disk so re-running a batch skips
+    # downscaling them again. Off by default, since it stores a second copy
+    # of every large image.
+    cache_enabled: bool = False
+    cache_path: str = "~/.cache/tamu_batch_ai/images.sqlite"
+    cache_expire_days: int = 7
+
+
+@dataclass
+class HttpConfig:
+    """Configuration for the HTTP transport used by the Anthropic client."""
+
+    # Multiplex concurrent requests over one connection (requires h2)
+    http2: bool = True
+
+    # Connection pool limits
+    max_connections: int = 20
+    max_keepalive_connections: int = 20
+
+    # Seconds to wait for a response and for a connection to open.
+    # Non-streaming responses with a few thousand output tokens can take
+    # well over a minute, so the overall timeout is kept generous.
+    timeout: float = 120.0
+    connect_timeout: float = 10.0
+
+    # Retries for transient failures (connection errors, 408, 409, 429, 5xx
+    # and 529 overloaded), with exponential backoff that honours retry-after
+    max_retries: int = 3
+
+    # Requests kept in flight at once by the batch methods
+    max_concurrent_requests: int = 10
+
+
+@dataclass
+class MessageBatchConfig:
+    """Configuration for requests sent through the Message Batches API."""
+
+    # Seconds between status checks while a batch is processing
+    poll_interval: float = 30.0
+
+    # Split submissions to stay under the API's per-batch limits
+    # (100,000 requests and 256 MB)
+    max_requests: int = 100_000
+    max_bytes: int = 200_000_000
+
+
+@dataclass
+class CacheConfig:
+    """Configuration for caching Claude and Cloud Vision responses."""
+
+    # Reuse responses for identical requests (same image, prompt and model).
+    # Off by default: cached responses never expire, so a run with the
+    # cache on replays earlier (non-deterministic) output instead of asking
+    # Claude again.
+    enabled: bool = False
+
+    # SQLite database holding cached responses
+    path: str = "~/.cache/tamu_batch_ai/responses.sqlite"
+
+    # Also match near-duplicate metadata for the same image
+    # (requires sentence-transformers and faiss)
+    semantic_enabled: bool = False
+
+    # Embedding model and cosine similarity needed for a semantic hit
+    semantic_model: str = "all-MiniLM-L6-v2"
+    semantic_threshold: float = 0.95
+
+    # Keep Google Cloud Vision responses on disk, keyed by a hash of the
+    # image bytes, so re-running OCR on the same images is not billed again
+    vision_enabled: bool = True
+    vision_path: str = "~/.cache/tamu_batch_ai/vision.sqlite"
+
+    # Library of Congress Suggest and Did You Mean lookups remembered per
+    # process, for each endpoint; metadata batches repeat the same terms.
+    # Read on each lookup, and changing it starts with empty caches
+    lookup_cache_size: int = 4096
+
+
 # Global config instances
 model_config = ModelConfig()
 path_config = PathConfig()
+image_config = ImageConfig()
+http_config = HttpConfig()
+message_batch_config = MessageBatchConfig()
+cache_config = CacheConfig()
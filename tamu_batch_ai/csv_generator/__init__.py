@@ -1 +1 @@
-from .generate import process_json_directory
\ No newline at end of file
+from .generate import process_json_directory, process_json_records
\ No newline at end of file
@@ -1,8 +1,12 @@
-import json
 import os
 import csv
 from collections import defaultdict
-import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+import orjson
+
+# Directories with fewer JSON files than this are parsed in-process, since
+# starting worker processes would cost more than it saves
+PARALLEL_MIN_FILES = 64
 
 def extract_all_keys(obj, prefix="", keys_set=None):
     """
@@ -30,102 +34,169 @@ def flatten_json(obj, prefix=""):
     """
     flattened = {}
     
-    if isinstance(obj, dict):
-        for key, value in obj.items():
-            current_key = f"{prefix}.{key}" if prefix else key
-            if isinstance(value, (dict, list)) and value:
-                flattened.update(flatten_json(value, current_key))
-            else:
-                if isinstance(value, list):
-                    flattened[current_key] = "; ".join(map(str, value))
-                elif isinstance(value, dict):
-                    flattened[current_key] = str(value)
-                else:
+    # Walk with an explicit stack of (key, node, is_container) rather than
+    # recursing and merging a dict per level. Leaves before a node's first
+    # nested container are written straight away; the rest are pushed in
+    # reverse, so keys come out in the same depth-first order as before.
+    stack = [(prefix, obj, True)]
+    while stack:
+        key, node, is_container = stack.pop()
+        if not is_container:
+            flattened[key] = node
+            continue
+        deferred = None
+        if isinstance(node, dict):
+            for child_key, value in node.items():
+                current_key = f"{key}.{child_key}" if key else child_key
+                if isinstance(value, (dict, list)):
+                    if value:
+                        if deferred is None:
+                            deferred = []
+                        deferred.append((current_key, value, True))
+                        continue
+                    value = "; ".join(map(str, value)) if isinstance(value, list) else str(value)
+                if deferred is None:
                     flattened[current_key] = value
-    elif isinstance(obj, list):
-        for i, item in enumerate(obj):
-            list_key = f"{prefix}[{i}]" if prefix else f"[{i}]"
-            if isinstance(item, (dict, list)):
-                flattened.update(flatten_json(item, list_key))
-            else:
-                flattened[list_key] = item
+                else:
+                    deferred.append((current_key, value, False))
+        elif isinstance(node, list):
+            for i, item in enumerate(node):
+                list_key = f"{key}[{i}]" if key else f"[{i}]"
+                if isinstance(item, (dict, list)):
+                    if deferred is None:
+                        deferred = []
+                    deferred.append((list_key, item, True))
+                elif deferred is None:
+                    flattened[list_key] = item
+                else:
+                    deferred.append((list_key, item, False))
+        if deferred:
+            stack.extend(reversed(deferred))
     
     return flattened
 
-def process_json_directory(directory_path, output_csv="output.csv"):
+def _load_json(filepath):
+    """
+    Read and parse a JSON file
+    """
+    with open(filepath, 'rb') as f:
+        return orjson.loads(f.read())
+
+def _flatten_record(filename, data):
+    """
+    Flatten one parsed JSON record into a CSV row named by filename.
+    Returns (keys, flattened)
+    """
+    flattened = flatten_json(data)
+    flattened['_filename'] = filename
+    return extract_all_keys(data), flattened
+
+def _load_and_flatten(filepath):
+    """
+    Parse and flatten one JSON file. Runs in a worker process, so errors
+    are returned as text rather than raised.
+    Returns (keys, flattened, error)
+    """
+    try:
+        return *_flatten_record(os.path.basename(filepath), _load_json(filepath)), None
+    except Exception as e:
+        return None, None, str(e)
+
+def _load_directory(directory_path, max_workers=None):
+    """
+    Parse and flatten every JSON file in a directory, across processes
+    when there are enough files.
+    Returns a list of (filename, keys, flattened, error) in listing order
+    """
+    # One scan; hidden files (such as macOS "._" resource forks) and
+    # directories are skipped rather than reported as parse errors
+    with os.scandir(directory_path) as entries:
+        json_entries = [
+            entry for entry in entries
+            if entry.name.endswith('.json') and not entry.name.startswith('.') and entry.is_file()
+        ]
+    filenames = [entry.name for entry in json_entries]
+    paths = [entry.path for entry in json_entries]
+    if len(paths) < PARALLEL_MIN_FILES:
+        results = [_load_and_flatten(path) for path in paths]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(_load_and_flatten, paths, chunksize=32))
+    return [(filename, *result) for filename, result in zip(filenames, results)]
+
+def _write_flattened_csv(flattened_records, output_csv):
+    """
+    Write flattened records, given as (filename, keys, flattened, error),
+    to a CSV with one row each. Columns are every flattened key, in the
+    order they are first seen.
+    Returns (rows, sorted keys)
+    """
     all_keys = set()
+    columns = {}
     json_data = []
     
-    print("Scanning for unique keys...")
-    for filename in os.listdir(directory_path):
-        if filename.endswith('.json'):
-            filepath = os.path.join(directory_path, filename)
-            try:
-                with open(filepath, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    file_keys = extract_all_keys(data)
-                    all_keys.update(file_keys)
-                    print(f"Processed {filename}: {len(file_keys)} keys")
-            except Exception as e:
-                print(f"Error processing {filename}: {e}")
+    for filename, file_keys, flattened, error in flattened_records:
+        if error is not None:
+            print(f"Error processing {filename}: {error}")
+            continue
+        all_keys.update(file_keys)
+        columns.update(dict.fromkeys(flattened))
+        json_data.append(flattened)
+        print(f"Processed {filename}: {len(file_keys)} keys")
     
     print(f"\nFound {len(all_keys)} unique keys total")
     
-    print("\nFlattening JSON files...")
-    for filename in os.listdir(directory_path):
-        if filename.endswith('.json'):
-            filepath = os.path.join(directory_path, filename)
-            try:
-                with open(filepath, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    flattened = flatten_json(data)
-                    flattened['_filename'] = filename
-                    json_data.append(flattened)
-            except Exception as e:
-                print(f"Error flattening {filename}: {e}")
-    
     print(f"\nCreating CSV with {len(json_data)} records...")
-    df = pd.DataFrame(json_data)
-    
-    df = df.fillna('')
-    
-    df.to_csv(output_csv, index=False, encoding='utf-8')
+    with open(output_csv, 'w', newline='', encoding='utf-8') as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=list(columns), restval='', lineterminator='\n')
+        writer.writeheader()
+        writer.writerows(json_data)
     print(f"CSV saved as {output_csv}")
     
-    return df, sorted(all_keys)
+    return json_data, sorted(all_keys)
 
-def process_json_directory_csv_only(directory_path, output_csv="output.csv"):
+def process_json_directory(directory_path, output_csv="output.csv", max_workers=None):
+    """
+    Flatten every JSON file in a directory into one CSV row each.
+    Columns are every flattened key, in the order they are first seen.
+    Returns (rows, sorted keys), where rows is a list of row dicts; it was
+    a pandas DataFrame before, and pandas.DataFrame(rows) rebuilds one
+    """
+    # Each file is read and parsed once, then used for both its keys and its row
+    print("Scanning and flattening JSON files...")
+    return _write_flattened_csv(_load_directory(directory_path, max_workers), output_csv)
+
+def process_json_records(records, output_csv="output.csv"):
+    """
+    Flatten already parsed JSON records into one CSV row each, the same
+    way process_json_directory does for files, without a round trip
+    through disk.
+    records is an iterable of (filename, data) pairs; filename fills the
+    _filename column.
+    Returns (rows, sorted keys)
+    """
+    print("Flattening JSON records...")
+    return _write_flattened_csv(
+        ((filename, *_flatten_record(filename, data), None) for filename, data in records),
+        output_csv
+    )
+
+def process_json_directory_csv_only(directory_path, output_csv="output.csv", max_workers=None):
     """
     Same functionality but using only built-in csv module
     """
     all_keys = set()
     json_data = []
     
-    for filename in os.listdir(directory_path):
-        if filename.endswith('.json'):
-            filepath = os.path.join(directory_path, filename)
-            try:
-                with open(filepath, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    file_keys = extract_all_keys(data)
-                    all_keys.update(file_keys)
-            except Exception as e:
-                print(f"Error processing {filename}: {e}")
+    for filename, file_keys, flattened, error in _load_directory(directory_path, max_workers):
+        if error is not None:
+            print(f"Error processing {filename}: {error}")
+            continue
+        all_keys.update(file_keys)
+        json_data.append(flattened)
     
     sorted_keys = ['_filename'] + sorted(all_keys)
     
-    for filename in os.listdir(directory_path):
-        if filename.endswith('.json'):
-            filepath = os.path.join(directory_path, filename)
-            try:
-                with open(filepath, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    flattened = flatten_json(data)
-                    flattened['_filename'] = filename
-                    json_data.append(flattened)
-            except Exception as e:
-                print(f"Error processing {filename}: {e}")
-    
     with open(output_csv, 'w', newline='', encoding='utf-8') as csvfile:
         writer = csv.DictWriter(csvfile, fieldnames=sorted_keys, extrasaction='ignore')
         writer.writeheader()
@@ -139,7 +210,7 @@ def process_json_directory_csv_only(directory_path, output_csv="output.csv"):
 if __name__ == "__main__":
     directory = "tmp"
     
-    df, unique_keys = process_json_directory(
+    rows, unique_keys = process_json_directory(
         directory, 
         "flattened_data.csv"
     )
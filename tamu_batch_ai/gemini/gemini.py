@@ -1,32 +1,148 @@
 from google import genai
 from google.genai import types
-import PIL.Image
+import asyncio
+import mimetypes
 import os
+import sys
+import time
+from functools import lru_cache
 
-client = genai.Client(api_key=os.getenv("GEMINI_KEY"))
+from ..prompt_manager import prompt_manager
 
-with open('prompts/gemini-htr.md', 'r') as f:
-    prompt = f.read()
+MODEL = "gemini-3-pro-preview"
 
-img = PIL.Image.open('/Users/mark.baggett/Desktop/gemini_sample2_1.jpg')
+INSTRUCTION = "Please transcribe the following image according to the established guidelines:"
 
-response = client.models.generate_content(
-    model="gemini-3-pro-preview",
-    config=types.GenerateContentConfig(
+# Backoff for requests rejected by quota (429) or temporarily unavailable
+RETRY_OPTIONS = types.HttpRetryOptions(
+    attempts=5, initial_delay=1.0, max_delay=47.0, exp_base=2.0,
+    http_status_codes=[429, 500, 503]
+)
+
+
+def _new_client():
+    """Create a Gemini client that retries rate limited requests"""
+    return genai.Client(
+        api_key=os.getenv("GEMINI_KEY"),
+        http_options=types.HttpOptions(retry_options=RETRY_OPTIONS)
+    )
+
+
+@lru_cache(maxsize=None)
+def get_client():
+    """Get the shared Gemini client for synchronous calls"""
+    return _new_client()
+
+
+def load_prompt(name):
+    """Load a prompt template (cached by the prompt manager)"""
+    return prompt_manager.load_template(name)
+
+
+def _generation_config(prompt):
+    """Build the generation config for a system prompt"""
+    return types.GenerateContentConfig(
         system_instruction=prompt,
         temperature=0.7,
         thinking_config=types.ThinkingConfig(
             include_thoughts=True
         ),
-    ),
-    contents=[
-        "Please transcribe the following image according to the established guidelines:",
-        img
-    ]
-)
+    )
+
+
+def _image_part(image_path):
+    """Read an image file as an inline part.
+
+    The file's bytes are sent as they are, rather than decoded with PIL and
+    re-encoded by the SDK.
+    """
+    with open(image_path, 'rb') as image_file:
+        data = image_file.read()
+    mime_type = mimetypes.guess_type(image_path)[0] or 'image/jpeg'
+    return types.Part.from_bytes(data=data, mime_type=mime_type)
+
+
+def transcribe(image_path):
+    """Transcribe one image.
+
+    args:
+        image_path (str): path to an image
+
+    returns:
+        types.GenerateContentResponse: the Gemini response
+    """
+    return get_client().models.generate_content(
+        model=MODEL,
+        config=_generation_config(load_prompt('gemini-htr.md')),
+        contents=[INSTRUCTION, _image_part(image_path)]
+    )
+
+
+async def abatch_transcribe(image_paths, max_concurrency=8, rps=4):
+    """Transcribe many images concurrently.
+
+    At most max_concurrency requests are in flight and new requests start
+    no faster than rps per second. Requests rejected for quota are retried
+    with exponential backoff by the client.
+
+    args:
+        image_paths (list): paths to images
+        max_concurrency (int): requests in flight at once
+        rps (float): most requests started per second
+
+    returns:
+        list: for each path, in order, a types.GenerateContentResponse, or
+            the exception that request raised, so one failed page doesn't
+            discard the others
+    """
+    config = _generation_config(load_prompt('gemini-htr.md'))
+    semaphore = asyncio.Semaphore(max_concurrency)
+    gate = asyncio.Lock()
+    next_start = time.monotonic()
+
+    async def wait_turn():
+        nonlocal next_start
+        async with gate:
+            now = time.monotonic()
+            delay = next_start - now
+            next_start = max(next_start, now) + 1 / rps
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    async def transcribe_one(client, path):
+        async with semaphore:
+            part = await asyncio.to_thread(_image_part, path)
+            await wait_turn()
+            return await client.aio.models.generate_content(
+                model=MODEL, config=config, contents=[INSTRUCTION, part]
+            )
+
+    # Async HTTP connections are bound to the running event loop
+    client = _new_client()
+    try:
+        return await asyncio.gather(
+            *(transcribe_one(client, path) for path in image_paths),
+            return_exceptions=True
+        )
+    finally:
+        await client.aio.aclose()
+        client.close()
+
+
+if __name__ == '__main__':
+    image_paths = sys.argv[1:]
+    if not image_paths:
+        sys.exit("usage: python -m tamu_batch_ai.gemini.gemini IMAGE [IMAGE ...]")
+    responses = asyncio.run(abatch_transcribe(image_paths))
 
-for part in response.candidates[0].content.parts:
-    if part.thought:
-        print(f"--- THOUGHT PROCESS ---\n{part.text}\n")
-    else:
-        print(f"--- FINAL TRANSCRIPTION ---\n{part.text}")
+    for image_path, response in zip(image_paths, responses):
+        if len(image_paths) > 1:
+            print(f"=== {image_path} ===")
+        if isinstance(response, Exception):
+            print(f"Error transcribing {image_path}: {response}")
+            continue
+        for part in response.candidates[0].content.parts:
+            if part.thought:
+                print(f"--- THOUGHT PROCESS ---\n{part.text}\n")
+            else:
+                print(f"--- FINAL TRANSCRIPTION ---\n{part.text}")
@@ -1,10 +1,89 @@
+import asyncio
+import importlib.util
+import io
+import json
+import httpx
 import requests
 import difflib
+import heapq
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from urllib.parse import quote
-from lxml import etree
-from bs4 import BeautifulSoup as bSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from lxml import etree, html
 import logging
 
+from ..config import cache_config
+
+
+# (connect, read) seconds, so an unreachable host fails fast instead of
+# holding up a batch for the full read timeout
+TIMEOUT = (3.05, 10)
+
+
+@lru_cache(maxsize=None)
+def get_session():
+    """Get the shared HTTP session for id.loc.gov.
+
+    Connections are pooled and kept alive across searches, and requests
+    that fail with a connection error, 429 or 5xx are retried with backoff.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=32, pool_maxsize=32,
+        max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504),
+                          allowed_methods=frozenset(["GET"]))
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def _get_content(url):
+    """GET a URL on the shared session and return the body.
+
+    Raises requests.RequestException on failure, so the caches below only
+    ever hold successful responses.
+    """
+    response = get_session().get(url, timeout=TIMEOUT)
+    response.raise_for_status()
+    return response.content
+
+
+def _normalize_term(term):
+    """Normalize a LoC heading for scoring."""
+    return term.lower().replace("&amp;", "&").rstrip(".")
+
+
+@lru_cache(maxsize=1)
+def _lookup_caches(size):
+    """Get the per-process lookup caches for a cache size.
+
+    Suggest and Did You Mean responses are keyed by the full request URL,
+    which includes the authority and the quoted term, in separate caches so
+    one endpoint can't evict the other. Normalized headings are cached too,
+    since the same Suggest results are scored again for every query that
+    finds them; that cache is sized for about 16 headings per lookup.
+
+    Only the caches for the latest size are kept, so changing
+    cache_config.lookup_cache_size starts with empty caches.
+
+    Returns:
+        tuple: (Suggest content, Did You Mean content, clean term) functions
+    """
+    return (lru_cache(maxsize=size)(_get_content),
+            lru_cache(maxsize=size)(_get_content),
+            lru_cache(maxsize=size * 16)(_normalize_term))
+
+
+def _suggest_content(url):
+    return _lookup_caches(cache_config.lookup_cache_size)[0](url)
+
+
+def _did_you_mean_content(url):
+    return _lookup_caches(cache_config.lookup_cache_size)[1](url)
+
 
 class Recon:
     """Reconciliation object representing a LoC heading and its match score."""
@@ -17,27 +96,61 @@ class Recon:
         return f"{self.header} ({self.score:.3f})"
 
     @staticmethod
-    def reconcile(original, term_pairs, sort=False, limit=20):
+    def reconcile(original, term_pairs, sort=False, limit=20, min_score=0.0):
         """
         Appends a reconciliation score to each term-identifier pair.
 
+        Scores are difflib's Ratcliff/Obershelp ratio, 2 * matches / total
+        length.
+
         Args:
             original (str): The term to reconcile.
             term_pairs (list): List of (term, URI) tuples.
             sort (bool): Whether to sort by score.
             limit (int): Maximum results to return.
+            min_score (float): Drop candidates scoring below this.
 
         Returns:
             list: List of [score, (term, URI)] pairs.
         """
-        recon_scores = []
-        for term, uri in term_pairs:
-            clean_term = term.lower().replace("&amp;", "&").rstrip(".")
-            sim_ratio = round(difflib.SequenceMatcher(
-                None, original.lower(), clean_term).ratio(), 3)
-            recon_scores.append([sim_ratio, (term, uri)])
+        term_pairs = [(term, uri) for term, uri in term_pairs]
+        if not term_pairs:
+            return []
+        target = original.lower()
+        clean_term = _lookup_caches(cache_config.lookup_cache_size)[2]
+        clean_terms = [clean_term(term) for term, _ in term_pairs]
+        if min_score > 0:
+            # The ratio is at most 2 * shorter / total length, so terms
+            # too much longer or shorter than the original can't reach
+            # min_score and are dropped without being scored
+            size = len(target)
+            kept = [i for i, clean_term in enumerate(clean_terms)
+                    if 2 * min(size, len(clean_term)) >= min_score * (size + len(clean_term))]
+            term_pairs = [term_pairs[i] for i in kept]
+            clean_terms = [clean_terms[i] for i in kept]
+            if not term_pairs:
+                return []
+        # One matcher for every candidate, with the original as the first
+        # sequence as before. ratio() depends on the order, so the sides
+        # aren't swapped; only the candidate's index is rebuilt each time.
+        matcher = difflib.SequenceMatcher(None)
+        matcher.set_seq1(target)
+        ratios = []
+        for clean_term in clean_terms:
+            # Exact matches are common in Suggest results and need no matching pass
+            if clean_term == target:
+                ratios.append(1.0)
+            else:
+                matcher.set_seq2(clean_term)
+                ratios.append(matcher.ratio())
+        recon_scores = [[round(float(ratio), 3), pair] for ratio, pair in zip(ratios, term_pairs)
+                        if ratio >= min_score]
 
         if sort:
+            if isinstance(limit, int) and 0 <= limit < len(recon_scores):
+                # Top matches without sorting every candidate; ties keep
+                # their input order, as with the full sort
+                return heapq.nsmallest(limit, recon_scores, key=lambda x: -x[0])
             recon_scores.sort(key=lambda x: x[0], reverse=True)
         return recon_scores[:limit]
 
@@ -78,14 +191,36 @@ class SearchLoC:
         """Query the Suggest API for a term."""
         self.LOGGER.debug(f"HTTP request on Suggest API for {self.term}")
         try:
-            response = requests.get(self.suggest_uri + quote(self.term), timeout=10)
-            response.raise_for_status()
+            content = _suggest_content(self.suggest_uri + quote(self.term))
         except requests.RequestException as e:
             self.LOGGER.error(f"Suggest API request failed: {e}")
             return []
-        result = response.json()
+        result = json.loads(content)
         return self.__process_results(result)
 
+    async def search_terms_async(self, client):
+        """Query the Suggest API for a term on an async client.
+
+        Args:
+            client (httpx.AsyncClient): Client shared by concurrent searches.
+
+        Returns:
+            list: (term, URI) pairs, empty if the request or its response
+            fails, so one bad term doesn't abort a batch.
+        """
+        self.LOGGER.debug(f"Async HTTP request on Suggest API for {self.term}")
+        try:
+            response = await client.get(self.suggest_uri + quote(self.term))
+            response.raise_for_status()
+        except httpx.HTTPError as e:
+            self.LOGGER.error(f"Suggest API request failed: {e}")
+            return []
+        try:
+            return self.__process_results(response.json())
+        except (ValueError, LookupError, TypeError) as e:
+            self.LOGGER.error(f"Unexpected Suggest API response for {self.term}: {e}")
+            return []
+
     @staticmethod
     def __process_results(results):
         """Parse suggest API results into (term, URI) pairs."""
@@ -103,30 +238,52 @@ class SearchLoC:
         dym_url = dym_base + quote(self.term)
         self.LOGGER.debug(f"Querying DidYouMean with URL {dym_url}")
         try:
-            response = requests.get(dym_url, timeout=10)
-            response.raise_for_status()
+            content = _did_you_mean_content(dym_url)
         except requests.RequestException as e:
             self.LOGGER.error(f"DidYouMean request failed: {e}")
             return []
-        tree = etree.fromstring(response.content)
-        return [(child.text, child.attrib["uri"]) for child in iter(tree)]
+        return self.__process_did_you_mean(content)
+
+    @staticmethod
+    def __process_did_you_mean(content):
+        """Stream (term, URI) pairs from the children of a Did You Mean response.
+
+        Each child is cleared once read and dropped from the tree, so the
+        parsed document never grows beyond the entry being read.
+        """
+        id_pairs = []
+        depth = 0
+        for event, element in etree.iterparse(io.BytesIO(content), events=("start", "end")):
+            if event == "start":
+                depth += 1
+                continue
+            depth -= 1
+            if depth == 1:
+                id_pairs.append((element.text, element.attrib["uri"]))
+                element.clear()
+                while element.getprevious() is not None:
+                    del element.getparent()[0]
+        return id_pairs
 
     def search_terms_raw(self):
         """Scrape the first page of LoC search results if APIs fail."""
         self.LOGGER.debug(f"Web scraping page 1 of web results for {self.term}")
         search_uri = f"{self.__raw_uri_start}{quote(self.term)}{self.__raw_uri_end}"
         try:
-            response = requests.get(search_uri, timeout=10)
+            response = get_session().get(search_uri, timeout=TIMEOUT)
             response.raise_for_status()
         except requests.RequestException as e:
             self.LOGGER.error(f"Scrape request failed: {e}")
             return []
 
-        parser = bSoup(response.text, "html.parser")
+        # lxml's C parser on the raw bytes, decoded as response.text would
+        # be; the XPath is the CSS selector "td > a[href^='/authorities']"
+        parser = html.HTMLParser(encoding=response.encoding or "utf-8")
+        document = html.fromstring(response.content, parser=parser)
         results = []
-        for link in parser.select("td > a[href^='/authorities']"):
-            heading = link.text.strip()
-            term_id = link["href"].split("/")[-1]
+        for link in document.xpath("//td/a[starts-with(@href, '/authorities')]"):
+            heading = link.text_content().strip()
+            term_id = link.get("href").split("/")[-1]
             term_uri = self.get_term_uri(term_id)
             if term_uri and heading:
                 results.append((heading, term_uri))
@@ -143,12 +300,66 @@ class SearchLoC:
             results = self.search_terms_raw()
         return results
 
+    @classmethod
+    def batch_full_search(cls, terms, term_type='', workers=16, **kwargs):
+        """Run full_search for many terms concurrently.
+
+        Args:
+            terms (list): Terms to search for.
+            term_type (str): Authority to search ("names", "subjects" or all).
+            workers (int): Searches in flight at once.
+            **kwargs: Passed to full_search.
+
+        Returns:
+            list: Results of full_search for each term, in order.
+        """
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(lambda term: cls(term, term_type).full_search(**kwargs), terms))
+
     def get_term_uri(self, term_id, extension="html", include_ext=False):
         """Return the URI of a term given its ID."""
         term_uri = f"http://id.loc.gov/authorities{self.term_type}/{term_id}"
         return f"{term_uri}.{extension}" if include_ext else term_uri
 
 
+async def batch_reconcile(terms, term_type='', sort=True, limit=20, max_connections=64):
+    """Search the Suggest API for many terms concurrently and score the results.
+
+    Requests share one async client. With the h2 package installed they
+    are multiplexed over a single HTTP/2 connection.
+
+    Args:
+        terms (list): Terms to reconcile.
+        term_type (str): Authority to search ("names", "subjects" or all).
+        sort (bool): Whether to sort each term's matches by score.
+        limit (int): Maximum matches per term.
+        max_connections (int): Connections open at once.
+
+    Returns:
+        list: Recon.reconcile results for each term, in order.
+    """
+    searchers = [SearchLoC(term, term_type) for term in terms]
+    # Pool settings belong on the transport: a client given its own
+    # transport ignores its http2 and limits arguments
+    transport = httpx.AsyncHTTPTransport(
+        retries=3,
+        http2=importlib.util.find_spec("h2") is not None,
+        limits=httpx.Limits(max_connections=max_connections),
+    )
+    async with httpx.AsyncClient(
+        timeout=httpx.Timeout(TIMEOUT[1], connect=TIMEOUT[0]),
+        follow_redirects=True,
+        transport=transport,
+    ) as client:
+        results = await asyncio.gather(*(searcher.search_terms_async(client) for searcher in searchers))
+    return [Recon.reconcile(term, pairs, sort=sort, limit=limit) for term, pairs in zip(terms, results)]
+
+
+def reconcile_terms(terms, term_type='', sort=True, limit=20, max_connections=64):
+    """Synchronous wrapper around batch_reconcile for scripts and CLI commands."""
+    return asyncio.run(batch_reconcile(terms, term_type, sort, limit, max_connections))
+
+
 if __name__ == "__main__":
     search_term = "Faculty"
     searcher = SearchLoC(term=search_term, term_type="/subjects")
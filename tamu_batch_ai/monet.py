@@ -1,13 +1,154 @@
+import asyncio
 import click
-from tamu_batch_ai import ClaudeAV, ClaudeWork, process_json_directory
-from tamu_batch_ai.claude.htr import ClaudePage, ClaudeImage
+from tamu_batch_ai import ClaudeAV, ClaudeWork, process_json_records
+from tamu_batch_ai.claude.htr import ClaudePage, ClaudeImage, batch_get_metadata
+from tamu_batch_ai.config import http_config
 import os
+import re
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from tqdm import tqdm
 from csv import DictReader
-import json
-import urllib.request
+import orjson
+import httpx
+from os.path import basename, splitext
 from pathlib import Path
 
+# Caption files are named <stem>.caption.vtt or <stem>.vtt
+_VTT_EXT_RE = re.compile(r'\.(caption\.)?vtt$')
+
+
+def _run_parallel(func, items, workers=None, desc=None):
+    """Run func over items on a thread pool with a progress bar.
+
+    The work is almost all waiting on Claude, so threads let several
+    requests run at once. Results come back in the order of items.
+    """
+    with ThreadPoolExecutor(max_workers=workers or http_config.max_concurrent_requests) as executor:
+        return list(tqdm(executor.map(func, items), total=len(items), desc=desc))
+
+
+def _download_path(url, temp_dir, index):
+    """Local path for a downloaded image, numbered so URLs sharing a filename don't collide."""
+    filename = url.split('/')[-1].split('?')[0]  # Get filename from URL, remove query params
+    if not any(filename.lower().endswith(ext) for ext in ['.jpg', '.jpeg', '.png', '.gif', '.webp', '.tif', '.tiff']):
+        filename += '.jpg'  # Add extension if missing
+    return os.path.join(temp_dir, f"download_{index}_{filename}")
+
+
+async def _download_images(urls, temp_dir, max_concurrency=32):
+    """Download images concurrently on one async HTTP client.
+
+    Each response is streamed to disk in chunks rather than held in memory.
+
+    Args:
+        urls (list): Image URLs, downloaded once each.
+        temp_dir (str): Directory to write the images to.
+        max_concurrency (int): Downloads in flight at once.
+
+    Returns:
+        dict: The local path for each URL, or None where the download failed.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def download(client, url, local_path):
+        async with semaphore:
+            try:
+                async with client.stream("GET", url) as response:
+                    response.raise_for_status()
+                    with open(local_path, 'wb') as f:
+                        async for chunk in response.aiter_bytes(65536):
+                            f.write(chunk)
+                return local_path
+            except Exception as e:
+                print(f"Error downloading {url}: {e}")
+                if os.path.exists(local_path):
+                    os.remove(local_path)
+                return None
+
+    urls = list(dict.fromkeys(urls))
+    # The connection limit goes on the transport; a client given its own
+    # transport ignores its limits argument
+    transport = httpx.AsyncHTTPTransport(
+        retries=http_config.max_retries,
+        limits=httpx.Limits(max_connections=max_concurrency),
+    )
+    async with httpx.AsyncClient(
+        follow_redirects=True,
+        timeout=http_config.timeout,
+        transport=transport,
+    ) as client:
+        local_paths = await asyncio.gather(*(
+            download(client, url, _download_path(url, temp_dir, index))
+            for index, url in enumerate(urls)
+        ))
+    return dict(zip(urls, local_paths))
+
+
+@contextmanager
+def _output_directory(temporary_directory=None):
+    """Working directory for a command's saved JSON and downloads.
+
+    With no directory given, each run gets its own temporary directory,
+    which is removed when the command finishes. A directory given on the
+    command line is created if needed, cleared of files and left in place
+    afterwards.
+    """
+    if temporary_directory is None:
+        with tempfile.TemporaryDirectory(prefix="monet_") as directory:
+            yield directory
+        return
+    os.makedirs(temporary_directory, exist_ok=True)
+    for filename in os.listdir(temporary_directory):
+        filepath = os.path.join(temporary_directory, filename)
+        if os.path.isfile(filepath):
+            os.remove(filepath)
+    yield temporary_directory
+
+
+def _metadata_record(work, metadata, output_path, keep_json):
+    """Pair Claude metadata with its file name for the output CSV.
+
+    The metadata is also saved as JSON with save_metadata when keep_json is
+    set. Metadata holding an error is reported and left out, as
+    save_metadata does.
+
+    Returns:
+        tuple: (file name, metadata), or None for an error.
+    """
+    if keep_json:
+        json_path = work.save_metadata(metadata, output_path=output_path)
+        return (basename(json_path), metadata) if json_path else None
+    if "error" in metadata:
+        print(f"Cannot save metadata due to error: {metadata['error']}")
+        return None
+    return f"{basename(output_path)}.json", metadata
+
+
+def _work_cost(work, batch=False, name=None):
+    """Cost of a Claude object's last request in USD, or 0 if it can't be calculated.
+
+    calculate_cost() raises ValueError when there is no usage to price,
+    such as after a failed or cached request.
+    """
+    try:
+        cost = work.calculate_cost()['total_cost_usd']
+    except ValueError:
+        tqdm.write(f"Could not calculate costs for {name}." if name else "Could not calculate costs.")
+        return 0
+    # Message Batches API requests are billed at half the standard price
+    return cost / 2 if batch else cost
+
+
+def _json_record(data, json_path, keep_json):
+    """Pair data with its file name for the output CSV, also saving it to json_path when keep_json is set"""
+    if keep_json:
+        with open(json_path, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+    return basename(json_path), data
+
+
 @click.group()
 def cli() -> None:
     pass
@@ -29,36 +170,49 @@ def cli() -> None:
 @click.option(
     "--temporary_directory",
     "-t",
-    help="The temporary directory to write your output to",
-    default=".tmp"
+    help="A directory to also save each result as JSON in, cleared first (by default results are only written to the CSV)",
+    default=None
 )
-def describe_vtts(path_to_vtts, csv, temporary_directory) -> None:
-    total_cost = 0
-    os.makedirs(temporary_directory, exist_ok=True)
-    for filename in os.listdir(temporary_directory):
-        filepath = os.path.join(temporary_directory, filename)
-        if os.path.isfile(filepath):
-            os.remove(filepath)
-    for path, directories, files in os.walk(path_to_vtts):
-        for file in tqdm(files):
-            if '.vtt' in file:
-                av_work = ClaudeAV(vtt_file=f"{path}/{file}")
-                raw_response, metadata = av_work.get_metadata()
-                av_work.save_metadata(
-                    metadata,
-                    output_path=f"{temporary_directory}/{file.split('/')[-1].replace('.caption.vtt', '').replace('.vtt', '')}"
-                )
-                try:
-                    cost = av_work.calculate_cost()
-                    total_cost += cost['total_cost_usd']
-                except:
-                    print("Could not calculate costs.")
+@click.option(
+    "--workers",
+    "-w",
+    type=int,
+    help="Files to process at once (defaults to the configured request concurrency)",
+    default=None
+)
+@click.option(
+    "--batch",
+    is_flag=True,
+    help="Send metadata requests through the Message Batches API at half the cost (can take up to 24 hours)"
+)
+def describe_vtts(path_to_vtts, csv, temporary_directory, workers, batch) -> None:
+    keep_json = temporary_directory is not None
+    with _output_directory(temporary_directory) as temporary_directory:
+        vtt_files = [vtt_file for vtt_file in Path(path_to_vtts).rglob('*.vtt') if vtt_file.is_file()]
+
+        def describe_vtt(vtt_file):
+            av_work = ClaudeAV(vtt_file=str(vtt_file))
+            return av_work, None if batch else av_work.get_metadata()
+
+        described = _run_parallel(describe_vtt, vtt_files, workers)
+        works = [av_work for av_work, response in described]
+        responses = batch_get_metadata(works) if batch else [response for av_work, response in described]
+
+        total_cost = 0
+        records = []
+        for vtt_file, av_work, (raw_response, metadata) in zip(vtt_files, works, responses):
+            record = _metadata_record(
+                av_work,
+                metadata,
+                f"{temporary_directory}/{_VTT_EXT_RE.sub('', vtt_file.name)}",
+                keep_json
+            )
+            if record:
+                records.append(record)
+            total_cost += _work_cost(av_work, batch)
     
-    process_json_directory(
-        temporary_directory,
-        csv
-    )
-    print(f"Total cost estimates were approximately ${total_cost}.")
+        process_json_records(records, csv)
+        print(f"Total cost estimates were approximately ${total_cost}.")
 
 
 @cli.command(
@@ -78,40 +232,53 @@ def describe_vtts(path_to_vtts, csv, temporary_directory) -> None:
 @click.option(
     "--temporary_directory",
     "-t",
-    help="The temporary directory to write your output to",
-    default=".tmp"
+    help="A directory to also save each result as JSON in, cleared first (by default results are only written to the CSV)",
+    default=None
 )
-def describe_images_from_csv(input_csv, output_csv, temporary_directory) -> None:
-    total_cost = 0
-    os.makedirs(temporary_directory, exist_ok=True)
-    for filename in os.listdir(temporary_directory):
-        filepath = os.path.join(temporary_directory, filename)
-        if os.path.isfile(filepath):
-            os.remove(filepath)
-    with open(input_csv, newline="") as f:
-        total_rows = sum(1 for _ in f) - 1 
-    with open(input_csv, 'r') as my_csv:
-        reader = DictReader(my_csv)
-        for row in tqdm(reader, total=total_rows):
-            pages = row["Filenames"].split('|')
-            work = ClaudeWork(pages=pages)
-            raw_response, metadata = work.get_metadata()
+@click.option(
+    "--workers",
+    "-w",
+    type=int,
+    help="Rows to process at once (defaults to the configured request concurrency)",
+    default=None
+)
+@click.option(
+    "--batch",
+    is_flag=True,
+    help="Send metadata requests through the Message Batches API at half the cost (can take up to 24 hours)"
+)
+def describe_images_from_csv(input_csv, output_csv, temporary_directory, workers, batch) -> None:
+    keep_json = temporary_directory is not None
+    with _output_directory(temporary_directory) as temporary_directory:
+        with open(input_csv, 'r', newline='') as my_csv:
+            rows = list(DictReader(my_csv))
+
+        def describe_row(row):
+            work = ClaudeWork(pages=row["Filenames"].split('|'))
+            return work, None if batch else work.get_metadata()
+
+        described = _run_parallel(describe_row, rows, workers)
+        works = [work for work, response in described]
+        responses = batch_get_metadata(works) if batch else [response for work, response in described]
+
+        total_cost = 0
+        records = []
+        for index, (work, (raw_response, metadata)) in enumerate(zip(works, responses)):
             metadata["full_text"] = work.full_page_responses
-            work.save_metadata(
+            # Rows saved in the same second would share a timestamped
+            # filename, so each row gets its own
+            record = _metadata_record(
+                work,
                 metadata,
-                output_path=f"{temporary_directory}/metadata"
+                f"{temporary_directory}/metadata_{index}",
+                keep_json
             )
-            try:
-                    cost = work.calculate_cost()
-                    total_cost += cost['total_cost_usd']
-            except:
-                print("Could not calculate costs.")
+            if record:
+                records.append(record)
+            total_cost += _work_cost(work, batch)
     
-    process_json_directory(
-        temporary_directory,
-        output_csv=output_csv
-    )
-    print(f"Total cost estimates were approximately ${total_cost}.")
+        process_json_records(records, output_csv=output_csv)
+        print(f"Total cost estimates were approximately ${total_cost}.")
 
 
 @cli.command(
@@ -131,26 +298,25 @@ def describe_images_from_csv(input_csv, output_csv, temporary_directory) -> None
 @click.option(
     "--temporary_directory",
     "-t",
-    help="The temporary directory to write your output to",
-    default=".tmp"
+    help="A directory to also save each result as JSON in, cleared first (by default results are only written to the CSV)",
+    default=None
 )
-def generate_handwritten_text(input_csv, output_json, temporary_directory) -> None:
-    total_cost = 0
-    os.makedirs(temporary_directory, exist_ok=True)
-    for filename in os.listdir(temporary_directory):
-        filepath = os.path.join(temporary_directory, filename)
-        if os.path.isfile(filepath):
-            os.remove(filepath)
-
-    # Count total rows for progress bar
-    with open(input_csv, newline="") as f:
-        total_rows = sum(1 for _ in f) - 1
+@click.option(
+    "--workers",
+    "-w",
+    type=int,
+    help="Rows to process at once (defaults to the configured request concurrency)",
+    default=None
+)
+def generate_handwritten_text(input_csv, output_json, temporary_directory, workers) -> None:
+    keep_json = temporary_directory is not None
+    with _output_directory(temporary_directory) as temporary_directory:
+        with open(input_csv, 'r', newline='') as my_csv:
+            rows = list(DictReader(my_csv))
 
-    # Process each row in the CSV
-    with open(input_csv, 'r') as my_csv:
-        reader = DictReader(my_csv)
-        for row in tqdm(reader, total=total_rows, desc="Processing pages"):
+        def transcribe_row(row):
             pages = row["Filenames"].split('|')
+            row_cost = 0
 
             # Run HTR on each page
             htr_results = []
@@ -163,30 +329,29 @@ def generate_handwritten_text(input_csv, output_json, temporary_directory) -> No
                     "details": page_data
                 })
 
-                # Calculate cost for this page
-                try:
-                    cost = page.calculate_cost()
-                    total_cost += cost['total_cost_usd']
-                except:
-                    print(f"Could not calculate costs for {page_path}.")
+                row_cost += _work_cost(page, name=page_path)
 
-            # Save HTR results for this set of pages
-            output_filename = pages[0].split('/')[-1].replace('.jpg', '').replace('.png', '').replace('.tif', '')
+            # HTR results for this set of pages
+            output_filename = splitext(basename(pages[0]))[0]
             output_path = f"{temporary_directory}/{output_filename}_htr.json"
 
-            with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump({
-                    "pages": htr_results,
-                    "full_text": "\n\n".join([r["extracted_text"] for r in htr_results])
-                }, f, indent=2, ensure_ascii=False)
+            record = _json_record({
+                "pages": htr_results,
+                "full_text": "\n\n".join([r["extracted_text"] for r in htr_results])
+            }, output_path, keep_json)
+            return row_cost, record
 
-    # Process all JSON files into output CSV
-    process_json_directory(
-        temporary_directory,
-        output_csv=output_json
-    )
+        # Process the rows of the CSV concurrently
+        results = _run_parallel(transcribe_row, rows, workers, desc="Processing pages")
+        total_cost = sum(cost for cost, record in results)
 
-    print(f"Total cost estimates were approximately ${total_cost:.6f}.")
+        # Flatten the results into the output CSV
+        process_json_records(
+            [record for cost, record in results],
+            output_csv=output_json
+        )
+
+        print(f"Total cost estimates were approximately ${total_cost:.6f}.")
 
 
 @cli.command(
@@ -207,45 +372,33 @@ def generate_handwritten_text(input_csv, output_json, temporary_directory) -> No
 @click.option(
     "--temporary_directory",
     "-t",
-    help="The temporary directory to write your output to",
-    default=".tmp"
+    help="A directory to also save each result as JSON in, cleared first (by default results are only written to the CSV)",
+    default=None
 )
 def analyze_images(input_csv, output_csv, temporary_directory) -> None:
     total_cost = 0
+    records = []
     downloaded_files = []  # Track downloaded files for cleanup
+    keep_json = temporary_directory is not None
 
-    def download_image(url, temp_dir):
-        """Download image from URL to temporary directory."""
-        filename = url.split('/')[-1].split('?')[0]  # Get filename from URL, remove query params
-        if not any(filename.lower().endswith(ext) for ext in ['.jpg', '.jpeg', '.png', '.gif', '.webp', '.tif', '.tiff']):
-            filename += '.jpg'  # Add extension if missing
+    def is_url(image_path):
+        return image_path.startswith('http://') or image_path.startswith('https://')
 
-        local_path = os.path.join(temp_dir, f"download_{filename}")
+    with _output_directory(temporary_directory) as temporary_directory:
+        with open(input_csv, 'r', newline='') as my_csv:
+            rows = list(DictReader(my_csv))
 
         try:
-            urllib.request.urlretrieve(url, local_path)
-            downloaded_files.append(local_path)
-            return local_path
-        except Exception as e:
-            print(f"Error downloading {url}: {e}")
-            return None
-
-    # Create and clear temporary directory
-    os.makedirs(temporary_directory, exist_ok=True)
-    for filename in os.listdir(temporary_directory):
-        filepath = os.path.join(temporary_directory, filename)
-        if os.path.isfile(filepath):
-            os.remove(filepath)
-
-    # Count total rows for progress bar
-    with open(input_csv, newline="") as f:
-        total_rows = sum(1 for _ in f) - 1
-
-    try:
-        # Process each row in the CSV
-        with open(input_csv, 'r') as my_csv:
-            reader = DictReader(my_csv)
-            for idx, row in enumerate(tqdm(reader, total=total_rows, desc="Analyzing images")):
+            # Download every remote image up front, concurrently
+            urls = [row.get("image_path", "") for row in rows if is_url(row.get("image_path", ""))]
+            local_paths = {}
+            if urls:
+                print(f"Downloading {len(set(urls))} images...")
+                local_paths = asyncio.run(_download_images(urls, temporary_directory))
+                downloaded_files.extend(path for path in local_paths.values() if path)
+
+            # Process each row in the CSV
+            for idx, row in enumerate(tqdm(rows, desc="Analyzing images")):
                 image_path = row.get("image_path", "")
                 existing_metadata = row.get("existing_metadata", "")
                 material_type = row.get("material_type", "IMAGE")
@@ -255,11 +408,11 @@ def analyze_images(input_csv, output_csv, temporary_directory) -> None:
                     continue
 
                 # Check if image_path is a URL
-                is_url = image_path.startswith('http://') or image_path.startswith('https://')
+                from_url = is_url(image_path)
 
-                if is_url:
-                    # Download the image
-                    local_image_path = download_image(image_path, temporary_directory)
+                if from_url:
+                    # Use the downloaded image
+                    local_image_path = local_paths[image_path]
                     if not local_image_path:
                         print(f"Skipping row {idx+1}: failed to download {image_path}")
                         continue
@@ -280,39 +433,29 @@ def analyze_images(input_csv, output_csv, temporary_directory) -> None:
                 metadata["source_image"] = image_path  # Store original path/URL
                 metadata["material_type"] = material_type
 
-                # Save results
-                if is_url:
+                # Keep results
+                if from_url:
                     # Use URL-based filename
-                    output_filename = image_path.split('/')[-1].split('?')[0].replace('.jpg', '').replace('.png', '').replace('.tif', '')
+                    output_filename = splitext(basename(image_path).split('?')[0])[0]
                 else:
-                    output_filename = image_path.split('/')[-1].replace('.jpg', '').replace('.png', '').replace('.tif', '')
+                    output_filename = splitext(basename(image_path))[0]
 
                 output_path = f"{temporary_directory}/{output_filename}_analysis.json"
+                records.append(_json_record(metadata, output_path, keep_json))
 
-                with open(output_path, 'w', encoding='utf-8') as f:
-                    json.dump(metadata, f, indent=2, ensure_ascii=False)
+                total_cost += _work_cost(image_analyzer, name=image_path)
 
-                # Calculate cost
-                try:
-                    cost = image_analyzer.calculate_cost()
-                    total_cost += cost['total_cost_usd']
-                except:
-                    print(f"Could not calculate costs for {image_path}.")
-
-        # Process all JSON files into output CSV
-        process_json_directory(
-            temporary_directory,
-            output_csv=output_csv
-        )
+            # Flatten the results into the output CSV
+            process_json_records(records, output_csv=output_csv)
 
-        print(f"Total cost estimates were approximately ${total_cost:.6f}.")
+            print(f"Total cost estimates were approximately ${total_cost:.6f}.")
 
-    finally:
-        # Clean up downloaded files
-        for filepath in downloaded_files:
-            try:
-                if os.path.exists(filepath):
-                    os.remove(filepath)
-            except Exception as e:
-                print(f"Could not remove temporary file {filepath}: {e}")
+        finally:
+            # Clean up downloaded files
+            for filepath in downloaded_files:
+                try:
+                    if os.path.exists(filepath):
+                        os.remove(filepath)
+                except Exception as e:
+                    print(f"Could not remove temporary file {filepath}: {e}")
 
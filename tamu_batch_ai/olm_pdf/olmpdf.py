@@ -1,101 +1,164 @@
 #!/usr/bin/env python3
 
-import json
 import datetime
 import hashlib
-import base64
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 from io import BytesIO
 from PIL import Image
+import orjson
 
 # OlmOCR imports
-from mlx_vlm import load, apply_chat_template, generate
-from olmocr.data.renderpdf import render_pdf_to_base64png
-from olmocr.prompts import build_finetuning_prompt
-from olmocr.prompts.anchor import get_anchor_text
+from mlx_vlm import load, apply_chat_template, batch_generate, generate
+from mlx_lm.sample_utils import make_sampler
+
+from .render import page_inputs
 
 # PDF handling
-import PyPDF2
+import pypdfium2 as pdfium
+
+MAX_TOKENS = 1024
+TEMPERATURE = 0.1
+
+# Default cap on page rendering processes; a few keep the model fed, and
+# each one holds its own copy of the PDF and olmocr
+MAX_RENDER_WORKERS = 4
+
+
+@lru_cache(maxsize=1)
+def get_model(model_name):
+    """Load an OlmOCR model and processor once per process.
+
+    Only the most recent model is kept, so switching models frees the
+    weights of the previous one.
+
+    Returns:
+        tuple: (model, processor)
+    """
+    print("Loading OlmOCR model...")
+    return load(model_name)
+
+
+def _generate_page(model, processor, image, prompt):
+    """Generate OCR text for one page.
+
+    generate returns a GenerationResult whose text was detokenized
+    incrementally as it streamed, so it is used as is rather than decoding
+    tokens again here.
+    """
+    # Apply chat template
+    messages = [{"role": "user", "content": prompt}]
+    text_prompt = apply_chat_template(processor, model.config, messages)
 
+    result = generate(model, processor, text_prompt, image, max_tokens=MAX_TOKENS, temperature=TEMPERATURE)
+    return result.text
 
-def process_pdf_to_json(pdf_path, model_name="mlx-community/olmOCR-7B-0225-preview-4bit"):
+
+def _generate_pages(model, processor, images, prompts):
+    """Generate OCR text for several pages in one batched forward pass.
+
+    batch_generate applies the chat template itself and groups pages with
+    the same image size.
+    """
+    response = batch_generate(
+        model, processor, images=images, prompts=prompts,
+        max_tokens=MAX_TOKENS, sampler=make_sampler(TEMPERATURE)
+    )
+    return response.texts
+
+
+def process_pdf_to_json(pdf_path, model_name="mlx-community/olmOCR-7B-0225-preview-4bit", batch_size=4,
+                        render_workers=None):
     """
     Simple function to convert PDF to JSON using OlmOCR
 
     Args:
         pdf_path (str): Path to the PDF file
         model_name (str): OlmOCR model to use
+        batch_size (int): Pages to run through the model at once
+        render_workers (int): Processes rendering pages and extracting
+            anchor text (defaults to the number of CPUs, at most
+            MAX_RENDER_WORKERS)
 
     Returns:
         dict: Dolma-formatted document with OCR results
     """
 
-    # Load OlmOCR model
-    print("Loading OlmOCR model...")
-    model, processor = load(model_name)
-    config = model.config
+    # Load OlmOCR model, reused across PDFs in the same process
+    model, processor = get_model(model_name)
 
-    # Get PDF page count
-    with open(pdf_path, 'rb') as f:
-        pdf_reader = PyPDF2.PdfReader(f)
-        num_pages = len(pdf_reader.pages)
+    # Get PDF page count; PDFium reads it from the page tree without
+    # parsing the pages themselves
+    pdf = pdfium.PdfDocument(pdf_path)
+    try:
+        num_pages = len(pdf)
+    finally:
+        pdf.close()
 
     print(f"Processing {num_pages} pages from {pdf_path}")
 
-    # Process each page
-    full_text = ""
+    # OCR the pages a batch at a time. Pages are rendered in worker
+    # processes while the model runs, a bounded number of pages ahead so
+    # memory stays flat on long PDFs.
+    page_texts = {}
+    page_numbers = list(range(1, num_pages + 1))
+    render_workers = render_workers or min(os.cpu_count() or 1, MAX_RENDER_WORKERS)
+    with ProcessPoolExecutor(max_workers=render_workers) as executor:
+        rendering = deque()
+        pages_to_render = iter(page_numbers)
+        for start in range(0, num_pages, batch_size):
+            for page_num in pages_to_render:
+                rendering.append(executor.submit(page_inputs, pdf_path, page_num))
+                if len(rendering) >= batch_size + render_workers:
+                    break
+            batch = page_numbers[start:start + batch_size]
+            print(f"Processing pages {batch[0]}-{batch[-1]}/{num_pages}" if len(batch) > 1
+                  else f"Processing page {batch[0]}/{num_pages}")
+
+            images, prompts = [], []
+            for _ in batch:
+                image_data, prompt = rendering.popleft().result()
+                images.append(Image.open(BytesIO(image_data)))
+                prompts.append(prompt)
+            if len(batch) > 1:
+                try:
+                    page_texts.update(zip(batch, _generate_pages(model, processor, images, prompts)))
+                    continue
+                except Exception as e:
+                    # Retry page by page so one bad page doesn't cost the batch
+                    print(f"Error processing pages {batch[0]}-{batch[-1]}, retrying one at a time: {e}")
+            for page_num, image, prompt in zip(batch, images, prompts):
+                try:
+                    page_texts[page_num] = _generate_page(model, processor, image, prompt)
+                except Exception as e:
+                    print(f"Error processing page {page_num}: {e}")
+                    page_texts[page_num] = f"[ERROR: Could not process page {page_num} - {e}]"
+
+    # Assemble the text in page order, hashing it as it is built
+    text_parts = []
+    text_hash = hashlib.sha1()
     page_mappings = []
     char_position = 0
 
-    for page_num in range(1, num_pages + 1):
-        print(f"Processing page {page_num}/{num_pages}")
-
-        # Convert PDF page to image
-        image_base64 = render_pdf_to_base64png(pdf_path, page_num, target_longest_image_dim=1024)
-        image = Image.open(BytesIO(base64.b64decode(image_base64)))
-
-        # Create OCR prompt
-        anchor_text = get_anchor_text(pdf_path, page_num, pdf_engine="pdfreport", target_length=4000)
-        prompt = build_finetuning_prompt(anchor_text)
-
-        # Apply chat template
-        messages = [{"role": "user", "content": prompt}]
-        text_prompt = apply_chat_template(processor, config, messages)
-
-        # Generate OCR text
-        page_text = ""
-        try:
-            tokenizer = processor.tokenizer
-
-            for tokens in generate(model, processor, text_prompt, image, max_tokens=1024, temperature=0.1):
-                chunk = ""
-                if isinstance(tokens, str):
-                    chunk = tokens
-                elif hasattr(tokens, 'tolist'):
-                    tokens = tokens.tolist()
-                    if all(isinstance(t, int) for t in tokens):
-                        chunk = tokenizer.decode(tokens, skip_special_tokens=True)
-
-                if chunk:
-                    page_text += chunk
-
-        except Exception as e:
-            print(f"Error processing page {page_num}: {e}")
-            page_text = f"[ERROR: Could not process page {page_num} - {e}]"
-
+    for page_num in page_numbers:
         # Track character positions
         start_pos = char_position
-        clean_text = page_text.strip()
-        full_text += clean_text
+        clean_text = page_texts[page_num].strip()
         if page_num < num_pages:  # Add newline except for last page
-            full_text += "\n"
-        char_position = len(full_text)
+            clean_text += "\n"
+        text_parts.append(clean_text)
+        text_hash.update(clean_text.encode())
+        char_position += len(clean_text)
 
         # Store page mapping: [start_char, end_char, page_number]
         page_mappings.append([start_pos, char_position, page_num])
+    full_text = "".join(text_parts)
 
     # Create Dolma document structure
-    document_id = hashlib.sha1(full_text.encode()).hexdigest()
+    document_id = text_hash.hexdigest()
     timestamp = datetime.datetime.now().strftime("%Y-%m-%d")
 
     dolma_doc = {
@@ -123,8 +186,8 @@ def save_json_output(dolma_doc, output_path=None):
         source_file = dolma_doc["metadata"]["source_file"]
         output_path = Path(source_file).stem + "_ocr.json"
 
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(dolma_doc, f, indent=2, ensure_ascii=False)
+    with open(output_path, "wb") as f:
+        f.write(orjson.dumps(dolma_doc, option=orjson.OPT_INDENT_2))
 
     print(f"OCR results saved to: {output_path}")
     return output_path
@@ -0,0 +1,51 @@
+"""Page rendering and anchor text for olmOCR, run in worker processes.
+
+Kept apart from olmpdf so workers started with spawn (the default on macOS)
+import only olmocr's PDF helpers, not mlx-vlm and the model stack.
+"""
+
+import subprocess
+
+from olmocr.data.renderpdf import get_pdf_media_box_width_height
+from olmocr.prompts import build_finetuning_prompt
+from olmocr.prompts.anchor import get_anchor_text
+
+
+def render_page(pdf_path, page_num, target_longest_image_dim=1024):
+    """Render a PDF page with pdftoppm, as olmocr's render_pdf_to_base64png does.
+
+    The page comes back as the raw PPM pdftoppm writes, the same pixels
+    as its PNG output without compressing, base64 encoding and decoding
+    them again.
+
+    Returns:
+        bytes: The page as a PPM image
+    """
+    longest_dim = max(get_pdf_media_box_width_height(pdf_path, page_num))
+    result = subprocess.run(
+        [
+            "pdftoppm", "-f", str(page_num), "-l", str(page_num),
+            "-r", str(target_longest_image_dim * 72 / longest_dim),  # 72 pixels per point
+            pdf_path,
+        ],
+        timeout=120,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"pdftoppm failed on page {page_num}: {result.stderr.decode(errors='replace')}")
+    return result.stdout
+
+
+def page_inputs(pdf_path, page_num):
+    """Render a PDF page and build its OCR prompt.
+
+    Runs in a worker process, which opens the PDF itself, so it takes and
+    returns only picklable values.
+
+    Returns:
+        tuple: (PPM image bytes of the page, prompt text)
+    """
+    image_data = render_page(pdf_path, page_num)
+    anchor_text = get_anchor_text(pdf_path, page_num, pdf_engine="pdfreport", target_length=4000)
+    return image_data, build_finetuning_prompt(anchor_text)
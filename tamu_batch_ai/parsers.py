@@ -1,9 +1,21 @@
 """Parsers for different response formats (TOON, JSON)."""
 
+import csv
 import json
 import re
 from typing import Any, Dict
 
+# TOON literals, matched case-insensitively
+_LITERALS = {'true': True, 'false': False, 'null': None, 'none': None}
+
+# Response patterns, compiled once. Each is only run when the text holds
+# a character or fence it needs, which a plain substring check finds far
+# faster than the regex engine can rule it out.
+_JSON_DETECT = re.compile(r'^\s*\{', re.MULTILINE)
+_TOON_DETECT = re.compile(r'^\w+\|?:', re.MULTILINE)
+_JSON_FENCE = re.compile(r'```(?:json)?\s*(\{.*?\})\s*```', re.DOTALL)
+_TOON_FENCE = re.compile(r'```(?:toon)?\s*(.*?)\s*```', re.DOTALL)
+
 
 class TOONParser:
     """Parser for Token Object Notation (TOON) format.
@@ -38,44 +50,41 @@ class TOONParser:
         Returns:
             Parsed dictionary
         """
-        lines = toon_text.strip().split('\n')
         result = {}
         stack = [(result, -1)]  # (current_dict, indent_level)
+        parse_value = TOONParser._parse_value
 
-        for line in lines:
-            if not line.strip():
-                continue
-
+        for line in toon_text.strip().split('\n'):
             # Calculate indentation
-            indent = len(line) - len(line.lstrip())
-            stripped = line.strip()
+            stripped = line.lstrip()
+            indent = len(line) - len(stripped)
+            stripped = stripped.rstrip()
 
             # Skip empty or comment lines
-            if not stripped or stripped.startswith('#'):
+            if not stripped or stripped[0] == '#':
                 continue
 
-            # Pop stack until we find the right parent level
-            while stack and stack[-1][1] >= indent:
+            # Pop stack until we find the right parent level; the root is
+            # at -1, below any indent, so it is never popped
+            while stack[-1][1] >= indent:
                 stack.pop()
 
-            current_dict = stack[-1][0] if stack else result
-
             # Parse key-value pair
-            if ':' in stripped:
-                key, value = stripped.split(':', 1)
-                key = key.strip()
-                value = value.strip()
-
-                # Check if this is a nested object (ends with |)
-                if key.endswith('|'):
-                    key = key[:-1].strip()
-                    nested_dict = {}
-                    current_dict[key] = nested_dict
-                    stack.append((nested_dict, indent))
-                else:
-                    # Parse the value
-                    parsed_value = TOONParser._parse_value(value)
-                    current_dict[key] = parsed_value
+            key, sep, value = stripped.partition(':')
+            if not sep:
+                continue
+
+            current_dict = stack[-1][0]
+            key = key.strip()
+
+            # Check if this is a nested object (ends with |)
+            if key.endswith('|'):
+                key = key[:-1].strip()
+                nested_dict = {}
+                current_dict[key] = nested_dict
+                stack.append((nested_dict, indent))
+            else:
+                current_dict[key] = parse_value(value)
 
         return result
 
@@ -95,31 +104,39 @@ class TOONParser:
         if not value:
             return ""
 
+        first = value[0]
+
         # Array notation [item1, item2, ...]
-        if value.startswith('[') and value.endswith(']'):
+        if first == '[' and value[-1] == ']':
             items_str = value[1:-1].strip()
             if not items_str:
                 return []
-            items = [item.strip() for item in items_str.split(',')]
-            return items
-
-        # Boolean values
-        if value.lower() == 'true':
-            return True
-        if value.lower() == 'false':
-            return False
-
-        # Null/None
-        if value.lower() in ('null', 'none'):
-            return None
+            # Items holding a comma, such as "Texas--History, 1846-1950",
+            # can be double quoted; only then is the csv reader needed
+            if '"' in items_str:
+                items = next(csv.reader([items_str], skipinitialspace=True))
+            else:
+                items = items_str.split(',')
+            return [item.strip() for item in items]
 
-        # Number (int or float)
-        try:
-            if '.' in value:
-                return float(value)
-            return int(value)
-        except ValueError:
-            pass
+        # Number (int or float). Anything int() or float() accepts starts
+        # with a digit, a sign or a decimal point, so other values skip the
+        # conversion attempt and the exception it would raise.
+        if first.isdecimal() or first in '+-.':
+            try:
+                if '.' in value:
+                    return float(value)
+                return int(value)
+            except ValueError:
+                pass
+            return value
+
+        # Boolean and null values. Short values such as "high" or "low"
+        # confidences are ruled out by their first letter without lowering
+        if len(value) <= 5 and first in 'tfnTFN':
+            lowered = value.lower()
+            if lowered in _LITERALS:
+                return _LITERALS[lowered]
 
         # Default to string
         return value
@@ -169,12 +186,13 @@ class ResponseParser:
         Returns:
             "json" or "toon"
         """
-        # Look for JSON markers
-        if re.search(r'^\s*\{', text, re.MULTILINE):
+        # Look for JSON markers, checking the common case of a response
+        # that is just a JSON object before scanning every line
+        if text.lstrip().startswith('{') or ('{' in text and _JSON_DETECT.search(text)):
             return "json"
 
         # Look for TOON markers (key: value or key|)
-        if re.search(r'^\w+(\|)?:\s*', text, re.MULTILINE):
+        if ':' in text and _TOON_DETECT.search(text):
             return "toon"
 
         # Default to JSON
@@ -191,16 +209,16 @@ class ResponseParser:
             Parsed JSON dictionary
         """
         # Try to find JSON in code blocks first
-        json_match = re.search(r'```(?:json)?\s*(\{.*?\})\s*```', text, re.DOTALL)
+        json_match = _JSON_FENCE.search(text) if '```' in text else None
         if json_match:
             json_str = json_match.group(1)
         else:
-            # Try to find raw JSON
-            json_match = re.search(r'\{.*\}', text, re.DOTALL)
-            if json_match:
-                json_str = json_match.group(0)
-            else:
+            # Try to find raw JSON, from the first { to the last }
+            start = text.find('{')
+            end = text.rfind('}')
+            if start == -1 or end < start:
                 raise ValueError("No JSON found in response")
+            json_str = text[start:end + 1]
 
         try:
             return json.loads(json_str)
@@ -218,7 +236,7 @@ class ResponseParser:
             Parsed TOON dictionary
         """
         # Try to find TOON in code blocks
-        toon_match = re.search(r'```(?:toon)?\s*(.*?)\s*```', text, re.DOTALL)
+        toon_match = _TOON_FENCE.search(text) if '```' in text else None
         if toon_match:
             toon_str = toon_match.group(1)
         else:
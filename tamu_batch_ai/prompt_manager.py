@@ -1,11 +1,38 @@
 """Prompt template management for TAMU Batch AI."""
 
+import os
+import re
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Tuple
 
 from .config import path_config
 
 
+@lru_cache(maxsize=64)
+def _placeholder_pattern(keys: Tuple[str, ...]):
+    """Compile one pattern matching every placeholder for a set of keys.
+
+    Args:
+        keys: Keyword argument names, in the order they were passed
+
+    Returns:
+        Tuple of (compiled pattern, dict of placeholder text to key)
+    """
+    lookup = {}
+    for key in keys:
+        # Convert underscores to spaces for placeholder matching
+        key_formatted = key.upper().replace('_', ' ')
+        for placeholder in (f"[INSERT {key_formatted} HERE]", f"[{key_formatted}]"):
+            lookup.setdefault(placeholder, key)
+    for key in keys:
+        lookup.setdefault(f"{{{key}}}", key)
+
+    # Longest first, so a placeholder is never cut short by one it contains
+    alternatives = sorted(lookup, key=len, reverse=True)
+    return re.compile('|'.join(map(re.escape, alternatives))), lookup
+
+
 class PromptManager:
     """Manages loading and rendering prompt templates."""
 
@@ -20,6 +47,8 @@ class PromptManager:
         if not self.prompts_dir.is_absolute():
             # Make relative to current working directory
             self.prompts_dir = Path.cwd() / self.prompts_dir
+        # Template contents by file name, read once per manager
+        self._templates = {}
 
     def load_template(self, prompt_name: str) -> str:
         """Load a prompt template from file.
@@ -27,6 +56,9 @@ class PromptManager:
         Args:
             prompt_name: Name of the prompt file (e.g., "metadata.md", "htr", "amc")
 
+        Templates are read from disk once and then served from memory, so
+        edits to a prompt file take effect in the next process.
+
         Returns:
             Template content as string
 
@@ -37,13 +69,19 @@ class PromptManager:
         if not prompt_name.endswith('.md'):
             prompt_name = f"{prompt_name}.md"
 
+        template = self._templates.get(prompt_name)
+        if template is not None:
+            return template
+
         prompt_path = self.prompts_dir / prompt_name
 
         if not prompt_path.exists():
             raise FileNotFoundError(f"Prompt template not found: {prompt_path}")
 
         with open(prompt_path, 'r', encoding='utf-8') as f:
-            return f.read()
+            template = f.read()
+        self._templates[prompt_name] = template
+        return template
 
     def render(self, template: str, **kwargs) -> str:
         """Render a template by replacing placeholders with values.
@@ -52,6 +90,9 @@ class PromptManager:
         - [INSERT TEXT HERE]
         - {variable_name}
 
+        All placeholders are replaced in a single pass over the template, so
+        values are inserted as they are and never searched for placeholders.
+
         Args:
             template: Template string with placeholders
             **kwargs: Key-value pairs to replace in template
@@ -59,25 +100,12 @@ class PromptManager:
         Returns:
             Rendered template string
         """
-        rendered = template
-
-        # Replace bracket-style placeholders: [INSERT FOO HERE]
-        for key, value in kwargs.items():
-            # Convert underscores to spaces for placeholder matching
-            key_formatted = key.upper().replace('_', ' ')
-            bracket_placeholder = f"[INSERT {key_formatted} HERE]"
-            rendered = rendered.replace(bracket_placeholder, str(value))
+        if not kwargs:
+            return template
 
-            # Also support alternative formats
-            alt_placeholder = f"[{key_formatted}]"
-            rendered = rendered.replace(alt_placeholder, str(value))
-
-        # Replace brace-style placeholders: {foo}
-        for key, value in kwargs.items():
-            brace_placeholder = f"{{{key}}}"
-            rendered = rendered.replace(brace_placeholder, str(value))
-
-        return rendered
+        pattern, lookup = _placeholder_pattern(tuple(kwargs))
+        values = {key: str(value) for key, value in kwargs.items()}
+        return pattern.sub(lambda match: values[lookup[match.group(0)]], template)
 
     def load_and_render(self, prompt_name: str, **kwargs) -> str:
         """Load a template and render it with values.
@@ -98,13 +126,16 @@ class PromptManager:
         Returns:
             List of prompt template names (without .md extension)
         """
-        if not self.prompts_dir.exists():
+        try:
+            entries = os.scandir(self.prompts_dir)
+        except FileNotFoundError:
             return []
 
-        prompts = []
-        for file in self.prompts_dir.glob("*.md"):
-            prompts.append(file.stem)  # filename without extension
-
-        return sorted(prompts)
+        with entries:
+            # filename without extension
+            return sorted(
+                entry.name[:-3] for entry in entries
+                if entry.name.endswith('.md') and entry.is_file()
+            )
 
 prompt_manager = PromptManager()
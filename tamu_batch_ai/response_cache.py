@@ -0,0 +1,347 @@
+"""Caching of Claude and Cloud Vision responses and encoded images for TAMU Batch AI."""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .config import cache_config, image_config
+
+
+def make_key(*parts) -> bytes:
+    """Build a cache key from the parts that determine a response.
+
+    Args:
+        *parts: str, bytes or memoryview values (e.g. image data, prompt, model)
+
+    Returns:
+        SHA-256 digest of the parts
+    """
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part if isinstance(part, (bytes, memoryview)) else str(part).encode('utf-8'))
+        digest.update(b"\0")
+    return digest.digest()
+
+
+class ResponseCache:
+    """Exact-match cache of Claude responses stored in SQLite."""
+
+    def __init__(self, path: Optional[str] = None):
+        """Open (or create) the cache database.
+
+        Args:
+            path: Path to the SQLite file. Defaults to config.cache_config.path
+        """
+        self.path = Path(os.path.expanduser(path or cache_config.path))
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses "
+            "(hash BLOB PRIMARY KEY, response_json TEXT, usage_json TEXT)"
+        )
+        self._conn.commit()
+
+    def get(self, key: bytes) -> Optional[Tuple[str, Dict]]:
+        """Look up a cached response.
+
+        Args:
+            key: Cache key from make_key()
+
+        Returns:
+            Tuple of (response_text, usage) or None if not cached
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response_json, usage_json FROM responses WHERE hash = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        return json.loads(row[0]), json.loads(row[1])
+
+    def set(self, key: bytes, response_text: str, usage: Dict) -> None:
+        """Store a response.
+
+        Args:
+            key: Cache key from make_key()
+            response_text: Response text from Claude
+            usage: Token usage of the original request
+        """
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?)",
+                (key, json.dumps(response_text), json.dumps(usage))
+            )
+            self._conn.commit()
+
+
+class ImageCache:
+    """Downscaled images stored in SQLite, keyed by file path and stat.
+
+    Only the JPEGs that _downscale_image produces are kept, as raw bytes, so
+    the cache never holds a copy of an original. A file that changes on
+    disk gets a new modification time and size, so a stale image is never
+    returned. Entries expire after config.image_config.cache_expire_days.
+    """
+
+    def __init__(self, path: Optional[str] = None, expire_days: Optional[int] = None):
+        """Open (or create) the cache database and drop expired entries.
+
+        Args:
+            path: Path to the SQLite file. Defaults to config.image_config.cache_path
+            expire_days: Days to keep an entry. Defaults to config.image_config.cache_expire_days
+        """
+        self.path = Path(os.path.expanduser(path or image_config.cache_path))
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.expire_seconds = 86400 * (expire_days if expire_days is not None else image_config.cache_expire_days)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        # Earlier versions kept base64 text of every image in an images table
+        dropped = self._conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'images'"
+        ).fetchone() is not None
+        self._conn.execute("DROP TABLE IF EXISTS images")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS downscaled "
+            "(path TEXT, mtime_ns INTEGER, size INTEGER, data BLOB, created REAL, "
+            "PRIMARY KEY (path, mtime_ns, size))"
+        )
+        expired = self._conn.execute(
+            "DELETE FROM downscaled WHERE created < ?", (time.time() - self.expire_seconds,)
+        ).rowcount
+        self._conn.commit()
+        if dropped or expired:
+            # Hand the freed pages back to the file system
+            self._conn.execute("VACUUM")
+
+    def get(self, path: str, mtime_ns: int, size: int) -> Optional[bytes]:
+        """Look up a downscaled image.
+
+        Args:
+            path: Absolute path of the image file
+            mtime_ns: File modification time in nanoseconds
+            size: File size in bytes
+
+        Returns:
+            JPEG bytes or None if not cached
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM downscaled "
+                "WHERE path = ? AND mtime_ns = ? AND size = ? AND created >= ?",
+                (path, mtime_ns, size, time.time() - self.expire_seconds)
+            ).fetchone()
+        return row[0] if row is not None else None
+
+    def set(self, path: str, mtime_ns: int, size: int, data: bytes) -> None:
+        """Store a downscaled image.
+
+        Args:
+            path: Absolute path of the image file
+            mtime_ns: File modification time in nanoseconds
+            size: File size in bytes
+            data: JPEG bytes from downscaling the image
+        """
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO downscaled VALUES (?, ?, ?, ?, ?)",
+                (path, mtime_ns, size, data, time.time())
+            )
+            self._conn.commit()
+
+
+class VisionCache:
+    """Serialized Cloud Vision responses stored in SQLite, keyed by a hash
+    of the image bytes and the request, so a renamed or copied file still
+    hits."""
+
+    def __init__(self, path: Optional[str] = None):
+        """Open (or create) the cache database.
+
+        Args:
+            path: Path to the SQLite file. Defaults to config.cache_config.vision_path
+        """
+        self.path = Path(os.path.expanduser(path or cache_config.vision_path))
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS vision "
+            "(hash BLOB PRIMARY KEY, response BLOB, created REAL)"
+        )
+        self._conn.commit()
+
+    def get(self, key: bytes) -> Optional[bytes]:
+        """Look up a cached response.
+
+        Args:
+            key: Cache key from make_key()
+
+        Returns:
+            Serialized AnnotateImageResponse or None if not cached
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response FROM vision WHERE hash = ?", (key,)
+            ).fetchone()
+        return row[0] if row is not None else None
+
+    def set(self, key: bytes, response: bytes) -> None:
+        """Store a response.
+
+        Args:
+            key: Cache key from make_key()
+            response: Serialized AnnotateImageResponse
+        """
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO vision VALUES (?, ?, ?)",
+                (key, response, time.time())
+            )
+            self._conn.commit()
+
+
+class SemanticCache:
+    """Near-duplicate cache of Claude responses using sentence embeddings.
+
+    Entries are grouped by a scope (e.g. a hash of the image and model), and a
+    lookup only matches entries in the same scope. That way near-identical
+    metadata for a different image never returns another item's response.
+    The index lives in memory for the life of the process.
+    """
+
+    def __init__(self, model_name: Optional[str] = None, threshold: Optional[float] = None):
+        """Load the embedding model and create an empty index.
+
+        Args:
+            model_name: sentence-transformers model (defaults to config.cache_config.semantic_model)
+            threshold: Cosine similarity needed for a hit (defaults to config.cache_config.semantic_threshold)
+        """
+        import faiss
+        from sentence_transformers import SentenceTransformer
+
+        self.model = SentenceTransformer(model_name or cache_config.semantic_model)
+        self.threshold = threshold if threshold is not None else cache_config.semantic_threshold
+        self.index = faiss.IndexFlatIP(self.model.get_sentence_embedding_dimension())
+        self.entries: List[Tuple[bytes, str, Optional[Dict]]] = []
+        self._lock = threading.Lock()
+
+    def embed(self, texts: List[str], batch_size: int = 64):
+        """Embed several texts in one call to the model.
+
+        Args:
+            texts: Texts to embed
+            batch_size: Texts per forward pass
+
+        Returns:
+            numpy array of normalized embeddings, one row per text
+        """
+        return self.model.encode(texts, batch_size=batch_size, convert_to_numpy=True, normalize_embeddings=True)
+
+    def get(self, scope: bytes, text: str, candidates: int = 5,
+            embedding=None) -> Optional[Tuple[str, Optional[Dict]]]:
+        """Find a cached response for similar text in the same scope.
+
+        Args:
+            scope: Scope key; only entries with the same scope can match
+            text: Text to compare (e.g. existing metadata)
+            candidates: Nearest neighbours to check for a scope match
+            embedding: Precomputed 1 x dim embedding of text from embed()
+
+        Returns:
+            Tuple of (response_text, usage) or None
+        """
+        if not self.entries:
+            return None
+        if embedding is None:
+            embedding = self.embed([text])
+        return self.get_many([scope], [embedding], candidates)[0]
+
+    def get_many(self, scopes: List[bytes], embeddings,
+                 candidates: int = 5) -> List[Optional[Tuple[str, Optional[Dict]]]]:
+        """Find cached responses for several texts with one index search.
+
+        Args:
+            scopes: Scope key for each text
+            embeddings: 1 x dim embedding of each text from embed()
+            candidates: Nearest neighbours to check for a scope match
+
+        Returns:
+            Tuple of (response_text, usage) or None for each scope
+        """
+        import numpy as np
+
+        if not self.entries:
+            return [None] * len(scopes)
+        with self._lock:
+            scores, ids = self.index.search(np.vstack(embeddings), min(candidates, len(self.entries)))
+            return [
+                next((self.entries[idx][1:] for score, idx in zip(row_scores, row_ids)
+                      if idx >= 0 and score >= self.threshold and self.entries[idx][0] == scope), None)
+                for scope, row_scores, row_ids in zip(scopes, scores, ids)
+            ]
+
+    def set(self, scope: bytes, text: str, response_text: str, embedding=None,
+            usage: Optional[Dict] = None) -> None:
+        """Add a response to the index.
+
+        Args:
+            scope: Scope key
+            text: Text the response was generated from
+            response_text: Response text from Claude
+            embedding: Precomputed 1 x dim embedding of text from embed()
+            usage: Token usage of the original request
+        """
+        if embedding is None:
+            embedding = self.embed([text])
+        with self._lock:
+            self.index.add(embedding)
+            self.entries.append((scope, response_text, usage))
+
+
+@lru_cache(maxsize=None)
+def get_response_cache() -> ResponseCache:
+    """Get the shared exact-match response cache."""
+    return ResponseCache()
+
+
+@lru_cache(maxsize=None)
+def get_image_cache() -> ImageCache:
+    """Get the shared on-disk downscaled image cache."""
+    return ImageCache()
+
+
+@lru_cache(maxsize=None)
+def get_vision_cache() -> VisionCache:
+    """Get the shared on-disk Cloud Vision response cache."""
+    return VisionCache()
+
+
+_semantic_cache: Optional[SemanticCache] = None
+_semantic_cache_loaded = False
+_semantic_cache_lock = threading.Lock()
+
+
+def get_semantic_cache() -> Optional[SemanticCache]:
+    """Get the shared semantic cache, or None if unavailable.
+
+    Every Claude object shares one cache, so the embedding model is loaded
+    once per process even when threads ask for it at the same time.
+    Returns None when the optional sentence-transformers/faiss packages are
+    not installed.
+    """
+    global _semantic_cache, _semantic_cache_loaded
+    with _semantic_cache_lock:
+        if not _semantic_cache_loaded:
+            try:
+                _semantic_cache = SemanticCache()
+            except ImportError as e:
+                print(f"Semantic cache disabled: {e}")
+            _semantic_cache_loaded = True
+    return _semantic_cache